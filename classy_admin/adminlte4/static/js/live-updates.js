@@ -0,0 +1,59 @@
+/**
+ * Live updates by Server-Sent Events
+ *
+ * An element with data-events-url opens an EventSource on that url. Each
+ * "change" event triggers "live:change" on the element and on descendants
+ * listening to it, like hx-trigger="live:change", which reload them.
+ */
+(function () {
+  "use strict";
+
+  var TRIGGER = "live:change";
+
+  function notify(element) {
+    htmx.trigger(element, TRIGGER);
+    element
+      .querySelectorAll("[hx-trigger*='" + TRIGGER + "']")
+      .forEach(function (target) {
+        htmx.trigger(target, TRIGGER);
+      });
+  }
+
+  function connect(element) {
+    if (element.liveEventSource) {
+      return;
+    }
+    var source = new EventSource(element.dataset.eventsUrl);
+    element.liveEventSource = source;
+    source.addEventListener("change", function () {
+      if (!element.isConnected) {
+        source.close();
+        return;
+      }
+      notify(element);
+    });
+  }
+
+  function connectAll(root) {
+    if (root.matches && root.matches("[data-events-url]")) {
+      connect(root);
+    }
+    root.querySelectorAll("[data-events-url]").forEach(connect);
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    connectAll(document);
+  });
+  // content loaded by htmx
+  document.addEventListener("htmx:load", function (event) {
+    connectAll(event.detail.elt);
+  });
+  // streams of removed content are closed
+  document.addEventListener("htmx:beforeCleanupElement", function (event) {
+    var source = event.detail.elt.liveEventSource;
+    if (source) {
+      source.close();
+      event.detail.elt.liveEventSource = null;
+    }
+  });
+})();
@@ -1,6 +1,10 @@
 from django.apps import AppConfig, apps
+from django.conf import settings
 
+from . import events
+from .cache import connect_signals
 from .registries import dashboard_registry, viewset_registry
+from .viewsets.home import register_dashboard, register_widgets
 
 
 class ClassyAdminConfig(AppConfig):
@@ -13,3 +17,36 @@ class ClassyAdminConfig(AppConfig):
         viewset_registry.autodiscover(app_names)
         # discover dashboard widgets
         dashboard_registry.autodiscover(app_names)
+        # dashboard of registered widgets, as home page, when enabled
+        if getattr(settings, "CLASSY_ADMIN_DASHBOARD", False):
+            register_dashboard()
+        if len(dashboard_registry):
+            register_widgets()
+        # publish changes of models refreshed live to their event streams
+        if getattr(settings, "CLASSY_ADMIN_EVENTS", True):
+            events.connect_signals(
+                {
+                    vs.model
+                    for vs in viewset_registry.values()
+                    if vs.model and vs.has_live_updates()
+                }
+                | {
+                    widget.live_model
+                    for widget in dashboard_registry.values()
+                    if widget.live_model is not None
+                }
+            )
+        # expire values cached by views and widgets on changes of their models
+        if getattr(settings, "CLASSY_ADMIN_TABLE_VERSIONS", True):
+            connect_signals(
+                {
+                    vs.model
+                    for vs in viewset_registry.values()
+                    if vs.model and vs.caches_query_values()
+                }
+                | {
+                    widget.live_model
+                    for widget in dashboard_registry.values()
+                    if widget.live_model is not None and widget.cache_timeout
+                }
+            )
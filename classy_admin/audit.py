@@ -0,0 +1,148 @@
+import atexit
+import logging
+import queue
+import threading
+from functools import cache, partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connections, router, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# "bulk_create", "queue", or an AuditWriter class or dotted path
+AUDIT_WRITER = getattr(settings, "CLASSY_ADMIN_AUDIT_WRITER", "bulk_create")
+AUDIT_BATCH_SIZE = getattr(settings, "CLASSY_ADMIN_AUDIT_BATCH_SIZE", 500)
+
+# LogEntry action flags, as in django.contrib.admin.models
+ADDITION = 1
+CHANGE = 2
+DELETION = 3
+
+
+def is_enabled(user) -> bool:
+    """Actions are logged for authenticated users, if django admin is installed"""
+    return apps.is_installed("django.contrib.admin") and user.is_authenticated
+
+
+def build_entries(user, instances, action_flag, change_message="") -> list:
+    """
+    Unsaved LogEntry of each instance, with its current primary key and
+    representation, so deleted objects are built before being deleted.
+    """
+    LogEntry = apps.get_model("admin", "LogEntry")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    return [
+        LogEntry(
+            user_id=user.pk,
+            content_type_id=ContentType.objects.get_for_model(
+                obj, for_concrete_model=False
+            ).pk,
+            object_id=str(obj.pk),
+            object_repr=str(obj)[:200],
+            action_flag=action_flag,
+            change_message=change_message,
+        )
+        for obj in instances
+    ]
+
+
+def log_entries(entries, using=None):
+    """Write entries in one batch when the current transaction commits"""
+    if entries:
+        transaction.on_commit(partial(get_audit_writer().write, entries), using=using)
+
+
+class AuditWriter:
+    batch_size = AUDIT_BATCH_SIZE
+
+    def write(self, entries):
+        raise NotImplementedError
+
+
+class BulkCreateAuditWriter(AuditWriter):
+    """Write entries in the request, with bulk_create"""
+
+    name = "bulk_create"
+
+    def write(self, entries):
+        LogEntry = apps.get_model("admin", "LogEntry")
+        # batch size of some backends is read from an open connection
+        connections[router.db_for_write(LogEntry)].ensure_connection()
+        LogEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+
+
+class QueuedAuditWriter(BulkCreateAuditWriter):
+    """
+    Write entries in a background thread, batching entries of many
+    requests. Entries are written in the request when the queue is full,
+    and pending ones when the process exits.
+    """
+
+    name = "queue"
+    maxsize = getattr(settings, "CLASSY_ADMIN_AUDIT_QUEUE_SIZE", 10000)
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=self.maxsize)
+        self.thread = None
+        self.lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="classy-admin-audit", daemon=True
+                )
+                self.thread.start()
+
+    def stop(self):
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def write(self, entries):
+        self.start()
+        try:
+            self.queue.put_nowait(entries)
+        except queue.Full:
+            super().write(entries)
+
+    def run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            batch, stop = list(batch), False
+            # drain what is queued into the same batch
+            while len(batch) < self.batch_size:
+                try:
+                    entries = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entries is None:
+                    stop = True
+                    break
+                batch.extend(entries)
+            try:
+                super().write(batch)
+            except Exception:
+                logger.exception("Could not write %d audit log entries", len(batch))
+            finally:
+                close_old_connections()
+            if stop:
+                return
+
+
+AUDIT_WRITERS = {
+    writer.name: writer for writer in (BulkCreateAuditWriter, QueuedAuditWriter)
+}
+
+
+@cache
+def get_audit_writer(writer=AUDIT_WRITER) -> AuditWriter:
+    """Return audit writer instance by name, dotted path or class"""
+    if isinstance(writer, str):
+        writer = AUDIT_WRITERS.get(writer) or import_string(writer)
+    return writer()
@@ -0,0 +1,111 @@
+import hashlib
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.autoreload import file_changed
+
+KEY_PREFIX = "classy_admin"
+CLASS_CACHE_SIZE = getattr(settings, "CLASSY_ADMIN_CLASS_CACHE_SIZE", 256)
+
+_class_caches = []
+
+
+def get_cache():
+    return caches[getattr(settings, "CLASSY_ADMIN_CACHE", "default")]
+
+
+def table_version_key(db_table):
+    return f"{KEY_PREFIX}:table-version:{db_table}"
+
+
+def get_table_versions(db_tables, cache=None):
+    """Return current version of each table, None if never changed"""
+    keys = {table_version_key(table): table for table in db_tables}
+    versions = (cache or get_cache()).get_many(keys)
+    return {table: versions.get(key) for key, table in keys.items()}
+
+
+def get_query_value(queryset, name, compute, timeout):
+    """
+    Return value computed from queryset rows, cached by the query SQL until
+    timeout or until a table read by the query is changed.
+    """
+    try:
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        return compute()
+    digest = hashlib.md5(
+        f"{queryset.db}:{sql}:{params!r}".encode(), usedforsecurity=False
+    ).hexdigest()
+    key = f"{KEY_PREFIX}:{name}:{digest}"
+    tables = sorted({alias.table_name for alias in queryset.query.alias_map.values()})
+    cache = get_cache()
+    versions = get_table_versions(tables, cache)
+    cached = cache.get(key)
+    if cached and cached[0] == versions:
+        return cached[1]
+    value = compute()
+    cache.set(key, (versions, value), timeout)
+    return value
+
+
+def get_permissions_fingerprint(user) -> str:
+    """Digest of user permissions, changing when any is granted or revoked"""
+    if not user.is_authenticated:
+        return "anonymous"
+    perms = ",".join(sorted(user.get_all_permissions()))
+    return hashlib.md5(
+        f"{user.pk}:{user.is_active}:{user.is_superuser}:{perms}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+def bump_table_version(sender, **kwargs):
+    """Mark rows of sender model table as changed, expiring cached values"""
+    if kwargs.get("action", "post_").startswith("post_"):
+        get_cache().set(table_version_key(sender._meta.db_table), time.time_ns(), None)
+
+
+def connect_signals(models):
+    """
+    Bump table versions of models, and of their many to many tables, on
+    changes. Versions are shared by processes only with a shared cache
+    backend, like Redis or Memcached, set by CLASSY_ADMIN_CACHE. With the
+    default per-process LocMemCache, values cached by other processes go
+    stale until their timeout.
+    """
+    # changes made by queryset update() and bulk operations don't send signals,
+    # cached values only expire on their timeout for those
+    for model in models:
+        uid = f"{KEY_PREFIX}:table-version:{model._meta.label_lower}"
+        post_save.connect(bump_table_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(bump_table_version, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                bump_table_version,
+                sender=field.remote_field.through,
+                dispatch_uid=uid,
+            )
+
+
+def class_cache(factory):
+    """
+    Memoize classes built by factory in a bounded cache, so each one is
+    built once per arguments instead of on every request. Arguments must be
+    hashable.
+    """
+    cached = lru_cache(maxsize=CLASS_CACHE_SIZE)(factory)
+    _class_caches.append(cached)
+    return cached
+
+
+def clear_class_caches(**kwargs):
+    for cached in _class_caches:
+        cached.cache_clear()
+
+
+file_changed.connect(clear_class_caches, dispatch_uid=f"{KEY_PREFIX}:class-caches")
@@ -1,11 +1,48 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
+from django.utils.translation import get_language
+
+from .cache import (
+    KEY_PREFIX,
+    get_cache,
+    get_permissions_fingerprint,
+    get_table_versions,
+)
+from .registries import viewset_registry
+
+# action of the default viewset rendering a single widget
+WIDGET_ACTION = "widget"
 
 
 class DashboardWidget:
     order = 99
     view = None
+    template_name: str = None
+    # name the widget is registered with, set by the dashboard
+    registry_name: str = None
+    # seconds the rendered widget is cached, None to not cache
+    cache_timeout: int = None
+    # cache by "user", by "permissions" of user, or shared by all if None
+    cache_vary: str = "permissions"
+    # render a placeholder, with the widget loaded by htmx after the page
+    lazy: bool = False
+    lazy_template_name = "dashboard/_lazy_widget.html"
+    # model shown, the widget is refreshed on changes streamed by its viewset
+    live_model = None
+    live_template_name = "dashboard/_live_widget.html"
+    # permissions needed to see the widget, view of live_model when not set
+    permission_required: list[str] = None
+    # seconds JSON data is reused by polls, at least, even if not cached
+    min_refresh_interval: int = getattr(
+        settings, "CLASSY_ADMIN_WIDGET_MIN_REFRESH_INTERVAL", 5
+    )
 
     @property
     def name(self):
@@ -14,21 +51,142 @@ class DashboardWidget:
     def __init__(self, request, *args, **kwargs):
         self.request = request
         self.args = args
+        self.rendered = None
         for k, v in kwargs.items():
             if hasattr(self, k):
                 setattr(self, k, v)
 
     def __str__(self):
-        return self.render()
+        if self.rendered is not None:
+            content = self.rendered
+        elif self.lazy and self.get_url():
+            content = self.render_placeholder()
+        else:
+            content = self.render()
+        events_url = self.get_events_url()
+        if events_url and self.get_url():
+            return self.render_live(content, events_url)
+        return content
 
     def get_context_data(self, **kwargs):
         return {}
 
+    def get_permission_required(self) -> list[str]:
+        if self.permission_required is not None:
+            return self.permission_required
+        if self.live_model is not None:
+            opts = self.live_model._meta
+            return [f"{opts.app_label}.view_{opts.model_name}"]
+        return []
+
+    def has_permission(self) -> bool:
+        return self.request.user.has_perms(self.get_permission_required())
+
+    def get_url(self):
+        """URL of the widget endpoint, on the viewset of the dashboard view"""
+        viewset = getattr(self.view, "viewset", None)
+        if viewset is None or self.registry_name is None:
+            return None
+        action = viewset.bound_actions.get(WIDGET_ACTION)
+        if action is None:
+            return None
+        return reverse(action.url_name, kwargs={"widget": self.registry_name})
+
+    def get_data_url(self):
+        """URL of the widget JSON data endpoint, named by registry name"""
+        viewset = getattr(self.view, "viewset", None)
+        if viewset is None or self.registry_name is None:
+            return None
+        action = viewset.bound_actions.get(self.registry_name)
+        if action is None:
+            return None
+        return reverse(action.url_name)
+
+    def get_events_url(self):
+        """URL of the events stream of the viewset of live_model"""
+        if self.live_model is None:
+            return None
+        for viewset in viewset_registry.values():
+            if viewset.model is self.live_model:
+                action = viewset.bound_actions.get("events")
+                if action is not None:
+                    return reverse(action.url_name)
+        return None
+
+    def get_cache_key(self):
+        user = self.request.user
+        if self.cache_vary == "user":
+            vary = user.pk
+        elif self.cache_vary == "permissions":
+            vary = get_permissions_fingerprint(user)
+        else:
+            vary = ""
+        key = f"{KEY_PREFIX}:widget:{self.name}:{vary}:{get_language()}"
+        if self.live_model is not None:
+            # expired by changes of the model, so refreshes are not stale
+            table = self.live_model._meta.db_table
+            key = f"{key}:{get_table_versions([table])[table]}"
+        return key
+
     def render(self):
+        """Render widget, or return it from cache when cache_timeout is set"""
+        if self.cache_timeout is None:
+            return self.render_content()
+        cache = get_cache()
+        key = self.get_cache_key()
+        content = cache.get(key)
+        if content is None:
+            content = self.render_content()
+            cache.set(key, str(content), self.cache_timeout)
+        return mark_safe(content)
+
+    def render_content(self):
         context = self.get_context_data()
         return mark_safe(
             render_to_string(self.template_name, context, request=self.request)
         )
 
+    def render_placeholder(self):
+        return mark_safe(
+            render_to_string(
+                self.lazy_template_name,
+                {"widget": self, "url": self.get_url()},
+                request=self.request,
+            )
+        )
+
+    def render_live(self, content, events_url):
+        return mark_safe(
+            render_to_string(
+                self.live_template_name,
+                {
+                    "widget": self,
+                    "content": content,
+                    "url": self.get_url(),
+                    "events_url": events_url,
+                },
+                request=self.request,
+            )
+        )
+
     def get_json_data(self):
         return {}
+
+    def get_json(self) -> tuple[str, str]:
+        """
+        Return (ETag, JSON of get_json_data), cached for cache_timeout, or
+        for min_refresh_interval when longer.
+        """
+        timeout = max(self.cache_timeout or 0, self.min_refresh_interval or 0)
+        cache = get_cache()
+        key = f"{self.get_cache_key()}:json"
+        if timeout:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        content = json.dumps(self.get_json_data(), cls=DjangoJSONEncoder)
+        digest = hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
+        etag = f'"{digest}"'
+        if timeout:
+            cache.set(key, (etag, content), timeout)
+        return etag, content
@@ -0,0 +1,14 @@
+from dynamic_preferences.preferences import Section
+from dynamic_preferences.types import LongStringPreference
+from dynamic_preferences.users.registries import user_preferences_registry
+
+classy_admin = Section("classy_admin")
+
+
+@user_preferences_registry.register
+class ViewPreferences(LongStringPreference):
+    """Views preferences, as JSON, used by DynamicPreferencesStore"""
+
+    section = classy_admin
+    name = "view_preferences"
+    default = "{}"
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from functools import cache, partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.module_loading import import_string
+
+from .cache import KEY_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# "local", "file", or an EventBackend class or dotted path
+EVENTS_BACKEND = getattr(settings, "CLASSY_ADMIN_EVENTS_BACKEND", "local")
+# events waiting to be sent to a client, more are dropped
+EVENTS_QUEUE_SIZE = getattr(settings, "CLASSY_ADMIN_EVENTS_QUEUE_SIZE", 16)
+
+
+def get_channel(model) -> str:
+    """Channel of changes of model rows"""
+    return model._meta.label_lower
+
+
+class Subscription:
+    """Events of a channel, received on the event loop of the subscriber"""
+
+    def __init__(self, hub, channel, maxsize=EVENTS_QUEUE_SIZE):
+        self.hub = hub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def __enter__(self):
+        self.hub.add(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.hub.remove(self)
+
+    def put(self, data):
+        # called from any thread
+        self.loop.call_soon_threadsafe(self._put, data)
+
+    def _put(self, data):
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # clients refresh on any event, the queued ones are enough
+            pass
+
+    async def get(self, timeout=None):
+        """Next event, or None after timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class EventHub:
+    """In-process publish/subscribe of events by channel"""
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, channel) -> Subscription:
+        return Subscription(self, channel)
+
+    def add(self, subscription):
+        with self.lock:
+            self.subscriptions[subscription.channel].add(subscription)
+
+    def remove(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.channel]
+
+    def has_subscribers(self, channel) -> bool:
+        return channel in self.subscriptions
+
+    def dispatch(self, channel, data):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(data)
+
+
+hub = EventHub()
+
+
+class EventBackend:
+    """Deliver published events to the hub of every process"""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def start(self):
+        """Start receiving events of other processes"""
+
+    def should_publish(self, channel) -> bool:
+        return True
+
+    def publish(self, channel, data):
+        raise NotImplementedError
+
+
+class LocalEventBackend(EventBackend):
+    """Events of this process only, for single process servers"""
+
+    name = "local"
+
+    def should_publish(self, channel):
+        return self.hub.has_subscribers(channel)
+
+    def publish(self, channel, data):
+        self.hub.dispatch(channel, data)
+
+
+class FileEventBackend(EventBackend):
+    """
+    Events shared by processes of a host through an append-only file,
+    tailed by a thread in each process. The file is truncated when larger
+    than max_size, events not yet read by a process may be lost. A
+    stand-in for a message broker, for development and tests.
+    """
+
+    name = "file"
+    path = getattr(
+        settings,
+        "CLASSY_ADMIN_EVENTS_FILE",
+        os.path.join(tempfile.gettempdir(), "classy-admin-events.jsonl"),
+    )
+    poll_interval = 0.2
+    max_size = getattr(settings, "CLASSY_ADMIN_EVENTS_FILE_MAX_SIZE", 1024 * 1024)
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self.thread = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(
+                    target=self.run, name="classy-admin-events", daemon=True
+                )
+                self.thread.start()
+
+    def stop(self):
+        if self.thread is not None and self.thread.is_alive():
+            self.stopped.set()
+            self.thread.join()
+
+    def publish(self, channel, data):
+        line = json.dumps({"channel": channel, "data": data}, cls=DjangoJSONEncoder)
+        # appends of a single write are not interleaved between processes
+        with open(self.path, "a", encoding="utf-8") as file:
+            if file.tell() > self.max_size:
+                # readers start over from the beginning of the truncated file
+                file.truncate(0)
+            file.write(line + "\n")
+
+    def run(self):
+        open(self.path, "a").close()
+        with open(self.path, encoding="utf-8") as file:
+            # only events published from now on
+            file.seek(0, os.SEEK_END)
+            pending = ""
+            while not self.stopped.is_set():
+                if os.path.getsize(self.path) < file.tell():
+                    # truncated
+                    file.seek(0)
+                    pending = ""
+                chunk = file.read()
+                if not chunk:
+                    self.stopped.wait(self.poll_interval)
+                    continue
+                pending += chunk
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    try:
+                        event = json.loads(line)
+                        self.hub.dispatch(event["channel"], event["data"])
+                    except (ValueError, KeyError):
+                        logger.warning("Invalid event line %r", line)
+
+
+EVENT_BACKENDS = {
+    backend.name: backend for backend in (LocalEventBackend, FileEventBackend)
+}
+
+
+@cache
+def get_event_backend(backend=EVENTS_BACKEND) -> EventBackend:
+    """Return event backend instance by name, dotted path or class"""
+    if isinstance(backend, str):
+        backend = EVENT_BACKENDS.get(backend) or import_string(backend)
+    return backend(hub)
+
+
+def publish_change(sender, instance=None, **kwargs):
+    """Publish change of a row of sender model, once the transaction commits"""
+    if not kwargs.get("action", "post_").startswith("post_"):
+        return
+    backend = get_event_backend()
+    channel = get_channel(sender)
+    if not backend.should_publish(channel):
+        return
+    data = {"model": channel, "pk": getattr(instance, "pk", None)}
+    if kwargs.get("signal") is post_delete:
+        data["deleted"] = True
+    transaction.on_commit(
+        partial(backend.publish, channel, data), using=kwargs.get("using")
+    )
+
+
+def publish_m2m_change(sender, instance, **kwargs):
+    """Publish change of relations as a change of the instance row"""
+    publish_change(type(instance), instance, **kwargs)
+
+
+def connect_signals(models):
+    """Publish changes of rows of models, sent by their signals"""
+    for model in models:
+        uid = f"{KEY_PREFIX}:events:{model._meta.label_lower}"
+        post_save.connect(publish_change, sender=model, dispatch_uid=uid)
+        post_delete.connect(publish_change, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                publish_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=uid,
+            )
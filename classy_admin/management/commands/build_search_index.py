@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from ...registries import viewset_registry
+from ...search import get_search_backend
+from ...views.list import SearchMixin
+
+
+class Command(BaseCommand):
+    help = "Build search indexes of viewsets views using full-text search backends."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Only build indexes of these apps or models.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop and build indexes that already exist.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Database to build indexes on. Defaults to "default".',
+        )
+
+    def get_search_backends(self, labels):
+        backends = []
+        for viewset in viewset_registry.values():
+            for action in viewset._actions.values():
+                if not issubclass(action.view_class, SearchMixin):
+                    continue
+                view = action.view_class(**viewset.get_view_kwargs(action))
+                model = view.model or viewset.model
+                if not view.search_fields or model is None:
+                    continue
+                if labels and not {
+                    model._meta.app_label,
+                    model._meta.label_lower,
+                } & {label.lower() for label in labels}:
+                    continue
+                backend = get_search_backend(
+                    view.search_backend, model, tuple(view.search_fields)
+                )
+                if backend not in backends:
+                    backends.append(backend)
+        return backends
+
+    def handle(self, *labels, rebuild=False, database=DEFAULT_DB_ALIAS, **options):
+        for backend in self.get_search_backends(labels):
+            if not backend.is_supported(database):
+                self.stdout.write(f"Skipped {backend!r}, database not supported.")
+            elif backend.build_index(database, rebuild=rebuild):
+                self.stdout.write(self.style.SUCCESS(f"Built {backend!r}."))
+            elif options["verbosity"] > 1:
+                self.stdout.write(f"Nothing to build for {backend!r}.")
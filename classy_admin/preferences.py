@@ -0,0 +1,122 @@
+import json
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .cache import KEY_PREFIX, get_cache
+
+PREFERENCES_STORE = getattr(settings, "CLASSY_ADMIN_PREFERENCES_STORE", "session")
+SESSION_KEY = f"{KEY_PREFIX}:preferences"
+DYNAMIC_PREFERENCE = "classy_admin__view_preferences"
+
+
+class PreferencesStore(ABC):
+    """
+    Preferences of the request user for a view, like list page size and
+    ordering. Loaded on first use and written by save() only when changed.
+    """
+
+    def __init__(self, request, key):
+        self.request = request
+        self.key = key
+        self.dirty = False
+        self._data = None
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.key}>"
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = dict(self.load() or {})
+        return self._data
+
+    def get(self, name, default=None):
+        return self.data.get(name, default)
+
+    def set(self, name, value):
+        if self.data.get(name) != value:
+            self.data[name] = value
+            self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            self.write(self.data)
+            self.dirty = False
+
+    @abstractmethod
+    def load(self) -> dict:
+        """Saved preferences, None when not saved"""
+
+    @abstractmethod
+    def write(self, data: dict):
+        """Save preferences"""
+
+
+class SessionPreferencesStore(PreferencesStore):
+    """Preferences of all views in a single session key"""
+
+    def load(self):
+        return self.request.session.get(SESSION_KEY, {}).get(self.key)
+
+    def write(self, data):
+        preferences = dict(self.request.session.get(SESSION_KEY, {}))
+        preferences[self.key] = data
+        self.request.session[SESSION_KEY] = preferences
+
+
+class CachePreferencesStore(SessionPreferencesStore):
+    """Preferences in the cache, by user, kept in session for anonymous users"""
+
+    timeout = getattr(settings, "CLASSY_ADMIN_PREFERENCES_TIMEOUT", None)
+
+    @property
+    def cache_key(self):
+        return f"{SESSION_KEY}:{self.request.user.pk}:{self.key}"
+
+    def load(self):
+        if not self.request.user.is_authenticated:
+            return super().load()
+        return get_cache().get(self.cache_key)
+
+    def write(self, data):
+        if not self.request.user.is_authenticated:
+            return super().write(data)
+        get_cache().set(self.cache_key, data, self.timeout)
+
+
+class DynamicPreferencesStore(SessionPreferencesStore):
+    """
+    Preferences in a django-dynamic-preferences user preference, as JSON,
+    kept in session for anonymous users. Needs dynamic_preferences.users
+    in INSTALLED_APPS.
+    """
+
+    def load(self):
+        if not self.request.user.is_authenticated:
+            return super().load()
+        preferences = json.loads(self.request.user.preferences[DYNAMIC_PREFERENCE])
+        return preferences.get(self.key)
+
+    def write(self, data):
+        if not self.request.user.is_authenticated:
+            return super().write(data)
+        user_preferences = self.request.user.preferences
+        preferences = json.loads(user_preferences[DYNAMIC_PREFERENCE])
+        preferences[self.key] = data
+        user_preferences[DYNAMIC_PREFERENCE] = json.dumps(preferences)
+
+
+PREFERENCES_STORES = {
+    "session": SessionPreferencesStore,
+    "cache": CachePreferencesStore,
+    "dynamic_preferences": DynamicPreferencesStore,
+}
+
+
+def get_preferences_store(store, request, key) -> PreferencesStore:
+    """Return preferences store by name, dotted path or class"""
+    if isinstance(store, str):
+        store = PREFERENCES_STORES.get(store) or import_string(store)
+    return store(request, key)
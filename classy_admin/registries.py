@@ -26,23 +26,20 @@ class ViewSetRegistry(Registry):
         if not namespace:
             namespace = self.namespace
         viewsets: list[ViewSet] = self.values()
-        return (
-            [
-                vs.get_url_path(namespace=namespace)
-                for vs in viewsets
-                if vs != self.default_viewset
-            ]
-            + [
-                path(
-                    "",
-                    include(
-                        self.default_viewset._urlpatterns(namespace=self.namespace)
-                    ),
-                )
-            ],
-            "viewsets",
-            namespace,
-        )
+        urlpatterns = [
+            vs.get_url_path(namespace=namespace)
+            for vs in viewsets
+            if vs != self.default_viewset
+        ] + [
+            path(
+                "",
+                include(self.default_viewset._urlpatterns(namespace=self.namespace)),
+            )
+        ]
+        # freeze viewset actions once url names are known
+        for vs in viewsets:
+            vs.finalize()
+        return (urlpatterns, "viewsets", namespace)
 
     def add_menu_items(self, menu_name: str | None = None):
         vs: ViewSet
@@ -0,0 +1,248 @@
+import hashlib
+from functools import cache
+
+from django.conf import settings
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from django.utils.text import smart_split, unescape_string_literal
+
+SEARCH_CONFIG = getattr(settings, "CLASSY_ADMIN_SEARCH_CONFIG", "simple")
+
+
+def split_terms(search_term: str) -> list[str]:
+    """Split search into words, keeping quoted phrases together"""
+    terms = []
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit:
+            terms.append(bit)
+    return terms
+
+
+class SearchBackend:
+    """
+    Filter a queryset by a search term over model fields. Backends with an
+    index are built by the build_search_index management command.
+    """
+
+    name: str = None
+    vendor: str = None
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.model._meta.label} {self.fields}>"
+
+    @property
+    def index_name(self):
+        digest = hashlib.md5(
+            ",".join(self.fields).encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"{self.model._meta.db_table[:13]}_srch_{digest[:8]}"
+
+    def is_supported(self, using) -> bool:
+        return self.vendor is None or connections[using].vendor == self.vendor
+
+    def search(self, queryset, search_term):
+        raise NotImplementedError
+
+    def build_index(self, using, rebuild=False):
+        """Create search index, or recreate it if rebuild. Return if changed"""
+        return False
+
+
+class IContainsSearchBackend(SearchBackend):
+    """Match rows with any field containing any of the terms"""
+
+    name = "icontains"
+
+    def search(self, queryset, search_term):
+        query = models.Q()
+        for term in split_terms(search_term):
+            for field in self.fields:
+                query |= models.Q((f"{field}__icontains", term))
+        return queryset.filter(query)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Full-text search with tsvector of fields, matched by a GIN expression
+    index and ordered by rank. Only fields of the model itself are indexed.
+    """
+
+    name = "postgres"
+    vendor = "postgresql"
+    config = SEARCH_CONFIG
+
+    def get_vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*self.fields, config=self.config)
+
+    def search(self, queryset, search_term):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(search_term, config=self.config, search_type="websearch")
+        return (
+            queryset.alias(search_vector=self.get_vector())
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(self.get_vector(), query))
+            .order_by("-search_rank", *queryset.query.order_by)
+        )
+
+    def build_index(self, using, rebuild=False):
+        from django.contrib.postgres.indexes import GinIndex
+
+        connection = connections[using]
+        index = GinIndex(self.get_vector(), name=self.index_name)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, self.model._meta.db_table
+            )
+        exists = self.index_name in constraints
+        if exists and not rebuild:
+            return False
+        with connection.schema_editor() as editor:
+            if exists:
+                editor.remove_index(self.model, index)
+            editor.add_index(self.model, index)
+        return True
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Full-text search with a FTS5 table of fields, kept in sync with model
+    table by triggers. Search falls back to icontains until the FTS table
+    is built. Only fields of the model itself are indexed, and the model
+    needs an integer primary key.
+    """
+
+    name = "sqlite"
+    vendor = "sqlite"
+
+    def __init__(self, model, fields):
+        super().__init__(model, fields)
+        self.columns = [model._meta.get_field(field).column for field in self.fields]
+        # databases with the FTS table, missing ones are checked again as the
+        # table may be built by another process
+        self._ready = set()
+
+    def is_ready(self, using):
+        if using not in self._ready:
+            connection = connections[using]
+            with connection.cursor() as cursor:
+                tables = connection.introspection.table_names(cursor)
+            if self.index_name in tables:
+                self._ready.add(using)
+        return using in self._ready
+
+    def trigger_name(self, suffix):
+        return f"{self.index_name}_{suffix}"
+
+    def match_expression(self, search_term):
+        # every term as a prefix, quoted to escape FTS query syntax
+        return " ".join(
+            '"{}"*'.format(term.replace('"', '""')) for term in split_terms(search_term)
+        )
+
+    def search(self, queryset, search_term):
+        if not self.is_ready(queryset.db):
+            return IContainsSearchBackend(self.model, self.fields).search(
+                queryset, search_term
+            )
+        match = self.match_expression(search_term)
+        if not match:
+            return queryset
+        index = connections[queryset.db].ops.quote_name(self.index_name)
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {index} WHERE {index} MATCH %s", [match])
+        )
+
+    def get_sql(self, connection):
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        index = quote(self.index_name)
+        pk = quote(self.model._meta.pk.column)
+        columns = ", ".join(quote(column) for column in self.columns)
+
+        def values(row):
+            return ", ".join(f"{row}.{quote(column)}" for column in self.columns)
+
+        insert = (
+            f"INSERT INTO {index}(rowid, {columns}) VALUES (new.{pk}, {values('new')});"
+        )
+        delete = (
+            f"INSERT INTO {index}({index}, rowid, {columns}) "
+            f"VALUES ('delete', old.{pk}, {values('old')});"
+        )
+        triggers = {
+            "ai": ("INSERT", insert),
+            "ad": ("DELETE", delete),
+            "au": ("UPDATE", f"{delete} {insert}"),
+        }
+        return [
+            (
+                f"CREATE VIRTUAL TABLE {index} USING fts5({columns}, "
+                f"content={table}, content_rowid={pk})"
+            ),
+            *(
+                f"CREATE TRIGGER {quote(self.trigger_name(suffix))} "
+                f"AFTER {event} ON {table} BEGIN {body} END"
+                for suffix, (event, body) in triggers.items()
+            ),
+            f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+        ]
+
+    def build_index(self, using, rebuild=False):
+        connection = connections[using]
+        exists = self.is_ready(using)
+        if exists and not rebuild:
+            return False
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            if exists:
+                for suffix in ("ai", "ad", "au"):
+                    cursor.execute(
+                        f"DROP TRIGGER IF EXISTS {quote(self.trigger_name(suffix))}"
+                    )
+                cursor.execute(f"DROP TABLE {quote(self.index_name)}")
+            for sql in self.get_sql(connection):
+                cursor.execute(sql)
+        self._ready.add(using)
+        return True
+
+
+SEARCH_BACKENDS = {
+    backend.name: backend
+    for backend in (IContainsSearchBackend, PostgresSearchBackend, SQLiteSearchBackend)
+}
+
+
+@cache
+def get_search_backend(backend, model, fields: tuple) -> SearchBackend:
+    """
+    Return search backend instance by name ("icontains", "postgres",
+    "sqlite", or "fulltext" for the one matching the database), dotted path
+    or class.
+    """
+    if backend == "fulltext":
+        vendor = connections[models.QuerySet(model).db].vendor
+        backend = next(
+            (b for b in SEARCH_BACKENDS.values() if b.vendor == vendor),
+            IContainsSearchBackend,
+        )
+    elif isinstance(backend, str):
+        backend = SEARCH_BACKENDS.get(backend) or import_string(backend)
+    return backend(model, fields)
+
+
+def search_queryset(backend, queryset, fields, search_term):
+    """Filter queryset using backend, or icontains if database is unsupported"""
+    search_backend = get_search_backend(backend, queryset.model, tuple(fields))
+    if not search_backend.is_supported(queryset.db):
+        search_backend = get_search_backend("icontains", queryset.model, tuple(fields))
+    return search_backend.search(queryset, search_term)
@@ -1,6 +1,7 @@
 from django import template
+from django.urls import reverse
 
-from ..viewsets.actions import Action
+from ..viewsets.actions import Action, check_object
 
 register = template.Library()
 
@@ -17,5 +18,35 @@ def action_check(context, action: Action, obj=None):
     {% endif %}
     """
     request = context.get("request", None)
+    if obj is not None:
+        return check_object(action, request, obj)
     check_func = action.check or Action.check
     return check_func(action, request, obj)
+
+
+@register.simple_tag(takes_context=True)
+def object_actions(context, obj):
+    """
+    Item actions of current view allowed for object.
+
+    Use:
+    {% object_actions record as actions %}
+    {% for action in actions.values %}
+        ...
+    {% endfor %}
+    """
+    return context["view"].actions.for_object(obj)
+
+
+@register.simple_tag
+def action_url(action: Action, obj=None):
+    """
+    Url of action, item actions urls are build from a precompiled template.
+
+    Use:
+    {% action_url action %}
+    {% action_url action object %}
+    """
+    if obj is None:
+        return reverse(action.url_name)
+    return action.get_object_url(obj)
@@ -0,0 +1,72 @@
+from django import template
+from django.conf import settings
+from django.utils.translation import get_language
+from simple_menu import Menu
+
+from ..cache import KEY_PREFIX, get_cache, get_permissions_fingerprint
+
+# seconds processed menus are cached, by permissions of user, 0 to not cache
+MENU_CACHE_TIMEOUT = getattr(settings, "CLASSY_ADMIN_MENU_CACHE_TIMEOUT", 300)
+
+register = template.Library()
+
+
+def menu_item_data(item) -> dict:
+    return {
+        "title": str(item.title),
+        "url": item.url,
+        "icon": getattr(item, "icon", None),
+        "exact_url": item.exact_url,
+        "children": [menu_item_data(child) for child in item.children],
+    }
+
+
+def get_menu_items(request, name) -> list[dict]:
+    """
+    Visible items of menu, processed once per permissions of user and
+    language, as the checks of items depend on them.
+    """
+    if not MENU_CACHE_TIMEOUT:
+        return [menu_item_data(item) for item in Menu.process(request, name)]
+    key = (
+        f"{KEY_PREFIX}:menu:{name}:"
+        f"{get_permissions_fingerprint(request.user)}:{get_language()}"
+    )
+    cache = get_cache()
+    items = cache.get(key)
+    if items is None:
+        items = [menu_item_data(item) for item in Menu.process(request, name)]
+        cache.set(key, items, MENU_CACHE_TIMEOUT)
+    return items
+
+
+def mark_active(items, path):
+    """Mark item with longest url matching path, and its parent, as active"""
+    active, active_parent = None, None
+    for item in items:
+        for candidate, parent in [(item, None)] + [
+            (child, item) for child in item["children"]
+        ]:
+            url = candidate["url"]
+            if not url or url == "#":
+                continue
+            matches = path == url if candidate["exact_url"] else path.startswith(url)
+            if matches and (active is None or len(active["url"]) < len(url)):
+                active, active_parent = candidate, parent
+    if active is not None:
+        active["active"] = True
+        if active_parent is not None:
+            active_parent["active"] = True
+    return items
+
+
+@register.simple_tag(takes_context=True)
+def cached_menu(context, name):
+    """
+    Items of menu for the current user, cached, with active item marked.
+
+    Use:
+    {% cached_menu "classy_admin" as menu %}
+    """
+    request = context["request"]
+    return mark_active(get_menu_items(request, name), request.path)
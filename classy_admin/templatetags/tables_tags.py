@@ -0,0 +1,20 @@
+from django import template
+
+from ..views.row_cache import render_row_cells
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def table_row_cells(context, row):
+    """
+    Render cells of a table row, using the table row cache if enabled.
+    Tables without row cache render cells inline, see list/_table.html.
+
+    Use:
+    <tr {{ row.attrs.as_html }}>{% table_row_cells row %}</tr>
+    """
+    row_cache = getattr(row.table, "row_cache", None)
+    if row_cache is None:
+        return render_row_cells(context, row)
+    return row_cache.render(context, row)
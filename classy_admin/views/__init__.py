@@ -1,17 +1,38 @@
 from .accounts import LoginView, LogoutView
-from .dashboard import DashboardView
+from .asynchronous import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncDetailView,
+    AsyncTableListView,
+    AsyncUpdateView,
+)
+from .bulk import BulkDeleteView, BulkUpdateView
+from .dashboard import DashboardView, DashboardWidgetDataView, DashboardWidgetView
 from .detail import DetailView
 from .edit import CreateView, DeleteView, FormView, UpdateView
+from .events import EventStreamView
+from .export import ExportView
 from .list import TableListView
 
 __all__ = [
+    "AsyncCreateView",
+    "AsyncDeleteView",
+    "AsyncDetailView",
+    "AsyncTableListView",
+    "AsyncUpdateView",
+    "BulkDeleteView",
+    "BulkUpdateView",
     "CreateView",
     "DeleteView",
     "DetailView",
+    "EventStreamView",
+    "ExportView",
     "TableListView",
     "UpdateView",
     "FormView",
     "DashboardView",
+    "DashboardWidgetDataView",
+    "DashboardWidgetView",
     "LoginView",
     "LogoutView",
 ]
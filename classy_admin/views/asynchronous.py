@@ -0,0 +1,182 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+
+from .detail import DetailView
+from .edit import CreateView, DeleteView, UpdateView
+from .list import TableListView
+
+
+def render_response(response):
+    """Render template responses, so they are not rendered by the handler"""
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    return response
+
+
+class AsyncViewMixin:
+    """
+    Handle requests as coroutines, for ASGI servers. User, permissions and
+    objects are loaded with the async ORM on the event loop. Building the
+    context and rendering the template, which are sync, run in a single
+    thread call.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated or not await self.ahas_permission():
+            return self.handle_no_permission()
+        method = request.method.lower()
+        if method in self.http_method_names:
+            handler = getattr(self, method, self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+        return await handler(request, *args, **kwargs)
+
+    async def ahas_permission(self):
+        """has_permission in a thread, with the checked object fetched first"""
+        if self.action.check and self.action.item and hasattr(self, "aget_object"):
+            # shared with get_object called by the permission check
+            await self.aget_object()
+        return await sync_to_async(self.has_permission)()
+
+    async def aget_validators(self):
+        if not self.conditional_get or not self.version_field:
+            return None
+        return await sync_to_async(self.get_validators)()
+
+    async def arender_to_response(self, **kwargs):
+        def render():
+            context = self.get_context_data(**kwargs)
+            return render_response(self.render_to_response(context))
+
+        return await sync_to_async(render)()
+
+    async def aget_response(self, **kwargs):
+        """Rendered response, or 304 Not Modified with conditional get"""
+        validators = await self.aget_validators()
+        if validators is None:
+            return await self.arender_to_response(**kwargs)
+        response = get_conditional_response(self.request, *validators)
+        if response is None:
+            response = await self.arender_to_response(**kwargs)
+        return self.add_validators(response, validators)
+
+
+class AsyncSingleObjectMixin:
+    async def aget_object(self):
+        """Fetch object once, shared with get_object, with the async ORM"""
+        if "_object_cache" not in self.__dict__:
+            queryset = self.get_queryset()
+            pk = self.kwargs.get(self.pk_url_kwarg)
+            slug = self.kwargs.get(self.slug_url_kwarg)
+            if pk is not None:
+                queryset = queryset.filter(pk=pk)
+            if slug is not None and (pk is None or self.query_pk_and_slug):
+                queryset = queryset.filter(**{self.get_slug_field(): slug})
+            try:
+                self._object_cache = await queryset.aget()
+            except queryset.model.DoesNotExist:
+                raise Http404(
+                    f"No {queryset.model._meta.verbose_name} found matching the query"
+                )
+        return self._object_cache
+
+
+class AsyncTableListView(AsyncViewMixin, TableListView):
+    """
+    TableListView counting rows and fetching the page with the async ORM,
+    in offset pagination with exact counts. Other pagination modes run in
+    a thread.
+    """
+
+    prepared_table = None
+
+    async def get(self, request, *args, **kwargs):
+        validators = await self.aget_validators()
+        if validators is not None:
+            response = get_conditional_response(request, *validators)
+            if response is not None:
+                return self.add_validators(response, validators)
+
+        def build_table():
+            self.object_list = self.get_queryset()
+            return self.build_table(**self.get_table_kwargs())
+
+        table = await sync_to_async(build_table)()
+        await self.apaginate_table(table)
+        self.prepared_table = table
+        response = await self.arender_to_response()
+        if validators is not None:
+            self.add_validators(response, validators)
+        return response
+
+    async def apaginate_table(self, table):
+        pagination = await sync_to_async(self.get_table_pagination)(table)
+        if not pagination:
+            return
+        queryset = table.data.data
+        paginator_class = pagination.get("paginator_class", Paginator)
+        if not isinstance(queryset, QuerySet) or paginator_class is not Paginator:
+            await sync_to_async(self.paginate_table)(table, pagination)
+            return
+        # counted on the loop, the paginator only reads the cached length
+        table.data._length = await queryset.acount()
+        self.paginate_table(table, pagination)
+        page_records = table.page.object_list.data
+        if isinstance(page_records, QuerySet):
+            # fill the result cache, rows are iterated when rendered
+            [record async for record in page_records]
+
+    def get_table(self, **kwargs):
+        if self.prepared_table is None:
+            return super().get_table(**kwargs)
+        return self.finalize_table(self.prepared_table)
+
+
+class AsyncDetailView(AsyncViewMixin, AsyncSingleObjectMixin, DetailView):
+    async def get(self, request, *args, **kwargs):
+        self.object = self.detail_object = await self.aget_object()
+        return await self.aget_response(object=self.object)
+
+
+class AsyncFormViewMixin(AsyncViewMixin):
+    """Async get and post of edit views, processing forms in a thread"""
+
+    async def aget_edited_object(self):
+        return None
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_edited_object()
+        return await self.arender_to_response()
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_edited_object()
+
+        def post():
+            response = super(AsyncFormViewMixin, self).post(request, *args, **kwargs)
+            return render_response(response)
+
+        return await sync_to_async(post)()
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+
+class AsyncCreateView(AsyncFormViewMixin, CreateView):
+    pass
+
+
+class AsyncUpdateView(AsyncFormViewMixin, AsyncSingleObjectMixin, UpdateView):
+    async def aget_edited_object(self):
+        return await self.aget_object()
+
+
+class AsyncDeleteView(AsyncFormViewMixin, AsyncSingleObjectMixin, DeleteView):
+    async def aget_edited_object(self):
+        return await self.aget_object()
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.post(request, *args, **kwargs)
@@ -1,6 +1,274 @@
-class BaseBulkhView:
-    pass
+from itertools import batched
 
+from django import forms
+from django.contrib import messages
+from django.db import transaction
+from django.forms.models import fields_for_model
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.views.generic.edit import FormView as DjangoFormView
 
-class BulkDeleteView(BaseBulkhView):
-    pass
+from ..audit import DELETION
+from ..cache import bump_table_version, class_cache
+from ..viewsets.base import WithActionMixin
+from .list import FilterMixin, SearchMixin
+from .mixins import FormHelperMixin, ViewSetMixin
+
+
+@class_cache
+def bulk_update_form_factory(model, fields: tuple):
+    """Form of model fields, without model validation of a single instance"""
+    return type(
+        f"{model.__name__}BulkUpdateForm",
+        (forms.Form,),
+        fields_for_model(model, fields=fields),
+    )
+
+
+class BulkQuerysetMixin:
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_template_names(self):
+        if self.template_name:
+            return [self.template_name]
+        opts = self.model._meta
+        return [f"{opts.app_label}/{opts.model_name}{self.template_name_suffix}.html"]
+
+
+class BaseBulkView(
+    WithActionMixin,
+    FormHelperMixin,
+    ViewSetMixin,
+    FilterMixin,
+    SearchMixin,
+    BulkQuerysetMixin,
+    DjangoFormView,
+):
+    """
+    Apply an action to rows selected in the list, by primary keys, or to all
+    rows matching the list filters and search when select_all is set. Rows
+    are changed by set-based queries, or in chunks, each in a transaction,
+    when objects need to be checked.
+    """
+
+    template_name_suffix = "_bulk"
+    form_class = forms.Form
+    filterset_fields = []
+    selection_kwarg = "pk"
+    select_all_kwarg = "select_all"
+    chunk_size = 500
+    # fields read for the logged representation of rows, all when None
+    log_repr_fields: list[str] = None
+    # item action with the object checks (check, check_many) applied to rows
+    item_action = None
+    bulk_message = "{action} {count} {name}?"
+    success_message = "{count} {name} processados com êxito."
+    empty_message = "Nenhum item selecionado."
+
+    def is_select_all(self):
+        return bool(self.request.GET.get(self.select_all_kwarg))
+
+    def get_selected_pks(self):
+        to_python = self.model._meta.pk.to_python
+        pks = []
+        for value in self.request.GET.getlist(self.selection_kwarg):
+            try:
+                pks.append(to_python(value))
+            except forms.ValidationError:
+                continue
+        return pks
+
+    def get_matching_queryset(self):
+        """Rows matching the list filters and search"""
+        queryset = self.get_filtered_queryset()
+        if self.filterset is not None and not self.filterset.is_valid():
+            # invalid filters would be ignored, selecting more rows
+            queryset = queryset.none()
+        return queryset
+
+    def get_selected_queryset(self):
+        queryset = self.get_matching_queryset()
+        if not self.is_select_all():
+            queryset = queryset.filter(pk__in=self.get_selected_pks())
+        # a plain queryset of the rows, as filters may join or make it distinct
+        return self.model._base_manager.filter(pk__in=queryset.values("pk"))
+
+    def has_selection(self):
+        return self.is_select_all() or bool(self.get_selected_pks())
+
+    def get_item_action(self):
+        if self.item_action:
+            return self.actions.registered().get(self.item_action)
+
+    def checks_objects(self) -> bool:
+        action = self.get_item_action()
+        return action is not None and bool(action.check or action.check_many)
+
+    def needs_objects(self) -> bool:
+        """If rows must be loaded and checked, in chunks, before changed"""
+        return self.checks_objects()
+
+    def log_queryset(self, queryset):
+        """
+        Log action on rows of queryset, read by one query before changed,
+        with entries built and written in chunks.
+        """
+        if not self.is_action_log_enabled():
+            return
+        if self.log_repr_fields is not None:
+            queryset = queryset.only("pk", *self.log_repr_fields)
+        rows = queryset.iterator(chunk_size=self.chunk_size)
+        for objects in batched(rows, self.chunk_size):
+            self.log_instances(objects, using=queryset.db)
+
+    def filter_allowed(self, objects: list) -> list:
+        """Objects the item action is allowed for"""
+        action = self.get_item_action()
+        if action is None:
+            return objects
+        if action.check_many is not None:
+            allowed = set(action.check_many(action, self.request, objects))
+            return [obj for obj in objects if obj.pk in allowed]
+        if action.check is not None:
+            return [obj for obj in objects if action.check(action, self.request, obj)]
+        return objects
+
+    def iter_chunks(self, queryset):
+        """Yield allowed objects of queryset, in chunks seeking by primary key"""
+        queryset = queryset.order_by("pk")
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            objects = list(chunk[: self.chunk_size])
+            if not objects:
+                return
+            last_pk = objects[-1].pk
+            yield self.filter_allowed(objects)
+
+    def perform(self, queryset, form) -> int:
+        """Apply action to rows of queryset, return number of rows changed"""
+        raise NotImplementedError
+
+    def get_bulk_message(self, count):
+        return self.bulk_message.format(
+            action=self.action.verbose_name,
+            count=count,
+            name=self.model._meta.verbose_name_plural,
+        )
+
+    def get_success_url(self):
+        url = reverse(self.actions.non_item_default.url_name)
+        # back to the list as filtered
+        query = self.request.GET.copy()
+        for key in (self.selection_kwarg, self.select_all_kwarg):
+            query.pop(key, None)
+        if query:
+            return f"{url}?{query.urlencode()}"
+        return url
+
+    def get_context_data(self, **kwargs):
+        count = self.get_selected_queryset().count()
+        return super().get_context_data(
+            **kwargs,
+            selected_count=count,
+            select_all=self.is_select_all(),
+            bulk_message=self.get_bulk_message(count),
+        )
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_selection():
+            messages.warning(request, self.empty_message)
+            return redirect(self.get_success_url())
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        if not self.has_selection():
+            messages.warning(request, self.empty_message)
+            return redirect(self.get_success_url())
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        count = self.perform(self.get_selected_queryset(), form)
+        messages.success(
+            self.request,
+            self.success_message.format(
+                count=count, name=self.model._meta.verbose_name_plural
+            ),
+        )
+        return redirect(self.get_success_url())
+
+
+# kept for compatibility
+BaseBulkhView = BaseBulkView
+
+
+class BulkDeleteView(BaseBulkView):
+    """
+    Delete selected rows with a single queryset delete, or in chunks when
+    objects are checked.
+    """
+
+    item_action = "delete"
+    action_log_flag = DELETION
+    bulk_message = "Tem certeza que deseja excluir {count} {name}?"
+    success_message = "{count} {name} foram excluídos com êxito."
+
+    def perform(self, queryset, form):
+        label = self.model._meta.label
+        if not self.needs_objects():
+            with transaction.atomic(using=queryset.db):
+                self.log_queryset(queryset)
+                _, deleted = queryset.delete()
+            bump_table_version(self.model)
+            return deleted.get(label, 0)
+        count = 0
+        for objects in self.iter_chunks(queryset):
+            if not objects:
+                continue
+            with transaction.atomic(using=queryset.db):
+                self.log_instances(objects, using=queryset.db)
+                _, deleted = self.model._base_manager.filter(
+                    pk__in=[obj.pk for obj in objects]
+                ).delete()
+            count += deleted.get(label, 0)
+        return count
+
+
+class BulkUpdateView(BaseBulkView):
+    """
+    Set form fields values on selected rows, with a single UPDATE, or in
+    chunks when objects are checked. Fields must be concrete model fields.
+    """
+
+    fields: list[str] = None
+    bulk_message = "{action} {count} {name}"
+    success_message = "{count} {name} foram atualizados com êxito."
+
+    def get_form_class(self):
+        if self.fields:
+            return bulk_update_form_factory(self.model, tuple(self.fields))
+        return super().get_form_class()
+
+    def get_update_values(self, form) -> dict:
+        return {name: form.cleaned_data[name] for name in form.fields}
+
+    def perform(self, queryset, form):
+        values = self.get_update_values(form)
+        if not self.needs_objects():
+            with transaction.atomic(using=queryset.db):
+                self.log_queryset(queryset)
+                count = queryset.update(**values)
+        else:
+            count = 0
+            for objects in self.iter_chunks(queryset):
+                if not objects:
+                    continue
+                with transaction.atomic(using=queryset.db):
+                    self.log_instances(objects, using=queryset.db)
+                    count += self.model._base_manager.filter(
+                        pk__in=[obj.pk for obj in objects]
+                    ).update(**values)
+        # update() sends no signals
+        bump_table_version(self.model)
+        return count
@@ -0,0 +1,97 @@
+import hashlib
+from datetime import datetime
+
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+from ..cache import get_permissions_fingerprint
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified, before querying rows or
+    rendering the template, when the client has the current version of the
+    page. Validators come from version_field, like an ``updated_at`` or
+    version counter field updated on every change of the rows. Changes of
+    related rows don't change the validators.
+    """
+
+    conditional_get = False
+    version_field: str = None
+
+    def get_version(self):
+        """Return (version, value for Last-Modified) of the displayed rows"""
+        raise NotImplementedError
+
+    def get_etag_parts(self, version) -> list:
+        request = self.request
+        return [
+            getattr(self.action, "url_name", request.path),
+            get_permissions_fingerprint(request.user),
+            get_language(),
+            bool(getattr(request, "htmx", None)),
+            sorted(request.GET.lists()),
+            version,
+        ]
+
+    def get_etag(self, version):
+        parts = repr(self.get_etag_parts(version)).encode()
+        return f'W/"{hashlib.md5(parts, usedforsecurity=False).hexdigest()}"'
+
+    def get_validators(self):
+        """Return (etag, last modified timestamp), or None to not validate"""
+        if not self.conditional_get or not self.version_field:
+            return None
+        # pending messages are displayed by the rendered page
+        if len(messages.get_messages(self.request)):
+            return None
+        version, modified = self.get_version()
+        if isinstance(modified, datetime):
+            modified = int(modified.timestamp())
+        else:
+            modified = None
+        return self.get_etag(version), modified
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(request, *validators)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, validators)
+
+    def add_validators(self, response, validators):
+        etag, last_modified = validators
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        # revalidated on each use, kept apart from full page versions
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["HX-Request"])
+        return response
+
+
+class ListConditionalGetMixin(ConditionalGetMixin):
+    def get_version(self):
+        result = (
+            self.get_filtered_queryset()
+            .order_by()
+            .aggregate(count=Count("pk"), version=Max(self.version_field))
+        )
+        # removed rows don't change the latest version, so no Last-Modified
+        return (result["count"], result["version"], self.preferences.data), None
+
+
+class DetailConditionalGetMixin(ConditionalGetMixin):
+    def get_version(self):
+        obj = self.get_object()
+        version = getattr(obj, self.version_field)
+        return (obj.pk, version), version
@@ -1,22 +1,117 @@
-from django.views.generic import TemplateView
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import close_old_connections
+from django.http import Http404, HttpResponse
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.generic import TemplateView, View
 
 from ..registries import dashboard_registry
 from .mixins import ViewSetMixin
 
+# threads rendering widgets of dashboards, shared by all requests
+DASHBOARD_WORKERS = getattr(settings, "CLASSY_ADMIN_DASHBOARD_WORKERS", 4)
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DASHBOARD_WORKERS, thread_name_prefix="classy-admin-widget"
+        )
+    return _executor
+
+
+def render_in_thread(widget, language, tz):
+    # language and timezone are activated per thread
+    try:
+        with translation.override(language), timezone.override(tz):
+            return widget.render()
+    finally:
+        close_old_connections()
+
 
 class DashboardView(ViewSetMixin, TemplateView):
     template_name = "dashboard.html"
     permission_required = []
+    # render widgets concurrently, with up to DASHBOARD_WORKERS threads
+    concurrent_widgets = DASHBOARD_WORKERS > 1
 
     def get_page_title(self):
         return "Dashboard"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    def get_widgets(self):
+        registered_widgets = sorted(
+            dashboard_registry.items(), key=lambda item: item[1].order
+        )
+        widgets = [
+            widget_class(self.request, view=self, registry_name=name)
+            for name, widget_class in registered_widgets
+        ]
+        return [widget for widget in widgets if widget.has_permission()]
 
-        registered_widgets = sorted(dashboard_registry.values(), key=lambda i: i.order)
-        context["widgets"] = [
-            widget_class(self.request, view=self) for widget_class in registered_widgets
+    def render_widgets(self, widgets):
+        """Render widgets not loaded lazily, concurrently, before the page"""
+        pending = [widget for widget in widgets if not widget.lazy]
+        if not self.concurrent_widgets or len(pending) < 2:
+            return
+        language, tz = translation.get_language(), timezone.get_current_timezone()
+        futures = [
+            get_executor().submit(render_in_thread, widget, language, tz)
+            for widget in pending
         ]
+        for widget, future in zip(pending, futures):
+            widget.rendered = future.result()
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        widgets = self.get_widgets()
+        self.render_widgets(widgets)
+        context["widgets"] = widgets
         return context
+
+
+def get_widget(view, name):
+    """Widget registered by name, if allowed for the user of the request"""
+    widget_class = dashboard_registry.get(name)
+    if widget_class is None:
+        raise Http404(f"Dashboard widget {name!r} is not registered.")
+    widget = widget_class(view.request, view=view, registry_name=name)
+    if not widget.has_permission():
+        raise PermissionDenied
+    return widget
+
+
+class DashboardWidgetView(ViewSetMixin, View):
+    """Render a single dashboard widget, loaded by lazy widgets"""
+
+    # checked by the widget
+    permission_required = []
+
+    def get(self, request, widget):
+        return HttpResponse(get_widget(self, widget).render())
+
+
+class DashboardWidgetDataView(ViewSetMixin, View):
+    """
+    JSON data of a dashboard widget, for polling charts. Answers 304 Not
+    Modified while data is unchanged, and lets clients reuse it for the
+    widget min_refresh_interval.
+    """
+
+    # checked by the widget
+    permission_required = []
+
+    def get(self, request):
+        widget = get_widget(self, self.action.widget)
+        etag, content = widget.get_json()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type="application/json")
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=widget.min_refresh_interval)
+        return response
@@ -5,10 +5,11 @@ from django.views.generic import DetailView as DjangoDetailView
 from django.views.generic.detail import SingleObjectMixin
 from django_tables2.utils import Accessor
 
-from .mixins import ViewSetMixin
+from .conditional import DetailConditionalGetMixin
+from .mixins import SingleObjectCacheMixin, ViewSetMixin
 
 
-class DetailMixin(SingleObjectMixin):
+class DetailMixin(SingleObjectCacheMixin, SingleObjectMixin):
     detail_fields = []
     object = None
 
@@ -65,7 +66,9 @@ class DetailMixin(SingleObjectMixin):
         return context
 
 
-class DetailView(ViewSetMixin, DetailMixin, DjangoDetailView):
+class DetailView(
+    ViewSetMixin, DetailConditionalGetMixin, DetailMixin, DjangoDetailView
+):
     template_name_suffix = "_detail"
 
     def get(self, request, *args, **kwargs):
@@ -6,18 +6,26 @@ from django.views.generic.edit import FormView as DjangoFormView
 from django.views.generic.edit import UpdateView as DjangoUpdateView
 
 from .log import ActionLogMixin
-from .mixins import FormHelperMixin, ViewSetMixin
+from .mixins import FormHelperMixin, SingleObjectCacheMixin, ViewSetMixin
 
 
 class CreateView(ActionLogMixin, FormHelperMixin, ViewSetMixin, DjangoCreateView):
     success_message = '{name} "{obj}" foi adicionado com êxito.'
 
 
-class UpdateView(ActionLogMixin, FormHelperMixin, ViewSetMixin, DjangoUpdateView):
+class UpdateView(
+    ActionLogMixin,
+    FormHelperMixin,
+    ViewSetMixin,
+    SingleObjectCacheMixin,
+    DjangoUpdateView,
+):
     success_message = '{name} "{obj}" foi atualizado com êxito.'
 
 
-class DeleteView(ActionLogMixin, ViewSetMixin, DjangoDeleteView):
+class DeleteView(
+    ActionLogMixin, ViewSetMixin, SingleObjectCacheMixin, DjangoDeleteView
+):
     delete_message = (
         "Tem certeza que excluir o {object._meta.verbose_name} <b>{object}</b>?"
     )
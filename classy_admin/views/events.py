@@ -0,0 +1,56 @@
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.generic import View
+
+from ..events import get_channel, get_event_backend, hub
+from .asynchronous import AsyncViewMixin
+from .mixins import ViewSetMixin
+
+# seconds between comments keeping idle streams open through proxies
+EVENTS_HEARTBEAT = getattr(settings, "CLASSY_ADMIN_EVENTS_HEARTBEAT", 15)
+
+
+def format_event(event, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class EventStreamView(AsyncViewMixin, ViewSetMixin, View):
+    """
+    Server-Sent Events stream of changes of the viewset model rows, sent as
+    "change" events. Streams are only served under ASGI, other servers
+    answer 204 No Content, which stops EventSource clients reconnecting.
+    """
+
+    event_name = "change"
+    heartbeat = EVENTS_HEARTBEAT
+    # milliseconds clients wait before reconnecting
+    retry = 5000
+
+    def get_channel(self):
+        return get_channel(self.model)
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        response = StreamingHttpResponse(
+            self.stream(self.get_channel()), content_type="text/event-stream"
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        # disable buffering of nginx
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, channel):
+        get_event_backend().start()
+        with hub.subscribe(channel) as subscription:
+            yield f"retry: {self.retry}\n\n"
+            while True:
+                data = await subscription.get(self.heartbeat)
+                if data is None:
+                    yield ": ping\n\n"
+                else:
+                    yield format_event(self.event_name, data)
@@ -0,0 +1,233 @@
+import csv
+import json
+import re
+import zipfile
+from decimal import Decimal
+from itertools import chain
+from xml.sax.saxutils import escape, quoteattr
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import Http404, StreamingHttpResponse
+from django.utils.encoding import force_str
+from django.utils.text import slugify
+from django_tables2.rows import BoundRow
+
+from .list import TableListView
+
+
+class Echo:
+    """File-like object returning what is written, to stream writers output"""
+
+    def write(self, value):
+        return value
+
+
+class StreamBuffer:
+    """Write-only file-like object keeping written bytes until popped"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class Exporter:
+    content_type: str = None
+    extension: str = None
+
+    def __init__(self, title):
+        self.title = title
+
+    def stream(self, header, rows):
+        """Yield file chunks for header and rows of values"""
+        raise NotImplementedError
+
+
+class CSVExporter(Exporter):
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def stream(self, header, rows):
+        writer = csv.writer(Echo())
+        # byte order mark, so spreadsheets detect encoding
+        yield "\ufeff" + writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+
+class JSONLinesExporter(Exporter):
+    content_type = "application/jsonl; charset=utf-8"
+    extension = "jsonl"
+
+    def stream(self, header, rows):
+        for row in rows:
+            line = json.dumps(
+                dict(zip(header, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+            )
+            yield f"{line}\n"
+
+
+XLSX_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_DOC_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{XLSX_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{XLSX_DOC_RELS}/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{XLSX_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{XLSX_DOC_RELS}/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+# characters not allowed in XML documents
+XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+# characters not allowed in sheet names
+SHEET_INVALID_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+class XLSXExporter(Exporter):
+    """
+    Write a single sheet workbook, streaming the zip archive as rows are
+    compressed. Text is written as inline strings, so no shared strings
+    table is kept in memory.
+    """
+
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+    flush_rows = 500
+
+    def get_workbook(self):
+        sheet_name = SHEET_INVALID_CHARS.sub("", self.title)[:31] or "Sheet1"
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{XLSX_NS}" xmlns:r="{XLSX_DOC_RELS}"><sheets>'
+            f'<sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/>'
+            "</sheets></workbook>"
+        )
+
+    def get_cell(self, value):
+        if value is None or value == "":
+            return "<c/>"
+        if isinstance(value, bool):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, Decimal)):
+            return f"<c><v>{value}</v></c>"
+        text = escape(XML_INVALID_CHARS.sub("", force_str(value)))
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def stream(self, header, rows):
+        buffer = StreamBuffer()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+            archive.writestr("_rels/.rels", XLSX_RELS)
+            archive.writestr("xl/workbook.xml", self.get_workbook())
+            archive.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+            yield buffer.pop()
+            with archive.open(
+                "xl/worksheets/sheet1.xml", "w", force_zip64=True
+            ) as sheet:
+                sheet.write(
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<worksheet xmlns="{XLSX_NS}"><sheetData>'.encode()
+                )
+                for index, row in enumerate(chain([header], rows), 1):
+                    cells = "".join(self.get_cell(value) for value in row)
+                    sheet.write(f'<row r="{index}">{cells}</row>'.encode())
+                    if index % self.flush_rows == 0:
+                        yield buffer.pop()
+                sheet.write(b"</sheetData></worksheet>")
+        yield buffer.pop()
+
+
+EXPORTERS = {
+    exporter.extension: exporter
+    for exporter in (CSVExporter, JSONLinesExporter, XLSXExporter)
+}
+
+
+class ExportView(TableListView):
+    """
+    Stream list rows, filtered, searched and ordered as in the list view,
+    as a file. Values are rendered by the table columns, like in
+    Table.as_values, and rows are fetched from database in chunks.
+    """
+
+    export_formats = tuple(EXPORTERS)
+    format_kwarg = "format"
+    chunk_size = 2000
+    actions_column = False
+    selection_column = False
+
+    def get_exporter(self):
+        export_format = self.request.GET.get(self.format_kwarg, self.export_formats[0])
+        if export_format not in self.export_formats:
+            raise Http404(f"Export format {export_format!r} is not available.")
+        return EXPORTERS[export_format](self.get_export_title())
+
+    def get_export_title(self):
+        return force_str(self.model._meta.verbose_name_plural).capitalize()
+
+    def get_preferences_key(self):
+        # rows are ordered as last seen in the list
+        list_action = self.actions.non_item_default
+        if list_action is None:
+            return super().get_preferences_key()
+        return list_action.url_name
+
+    def get_export_rows(self, table, columns):
+        data = table.data.data
+        if isinstance(data, QuerySet):
+            records = data.iterator(chunk_size=self.chunk_size)
+        else:
+            records = iter(data)
+        for record in records:
+            row = BoundRow(record, table=table)
+            yield [
+                force_str(row.get_cell_value(column.name), strings_only=True)
+                for column in columns
+            ]
+
+    def get(self, request, *args, **kwargs):
+        exporter = self.get_exporter()
+        table = self.build_table(**self.get_table_kwargs())
+        columns = [
+            column
+            for column in table.columns.iterall()
+            if not column.column.exclude_from_export
+        ]
+        header = [force_str(column.header) for column in columns]
+        response = StreamingHttpResponse(
+            exporter.stream(header, self.get_export_rows(table, columns)),
+            content_type=exporter.content_type,
+        )
+        filename = f"{slugify(exporter.title) or 'export'}.{exporter.extension}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -2,7 +2,7 @@ from extra_views.advanced import CreateWithInlinesView as BaseCreateWithInlinesV
 from extra_views.advanced import NamedFormsetsMixin
 from extra_views.advanced import UpdateWithInlinesView as BaseUpdateWithInlinesView
 
-from .mixins import FormHelperMixin, ViewSetMixin
+from .mixins import FormHelperMixin, SingleObjectCacheMixin, ViewSetMixin
 
 
 class CreateWithInlinesView(
@@ -12,6 +12,10 @@ class CreateWithInlinesView(
 
 
 class UpdateWithInlinesView(
-    ViewSetMixin, NamedFormsetsMixin, FormHelperMixin, BaseUpdateWithInlinesView
+    ViewSetMixin,
+    NamedFormsetsMixin,
+    FormHelperMixin,
+    SingleObjectCacheMixin,
+    BaseUpdateWithInlinesView,
 ):
     success_message = '{name} "{obj}" foi atualizado com êxito.'
@@ -1,28 +1,139 @@
+import logging
+
+from django import forms
+from django.conf import settings
+from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.db import models
-from django.utils.functional import cached_property
-from django.utils.text import smart_split, unescape_string_literal
+from django.urls import reverse
+from django.utils.functional import cached_property, lazy
 from django.views.generic import ListView as DjangoListView
+from django_filters.filterset import filterset_factory
 from django_filters.views import FilterMixin as BaseFilterMixin
 from django_tables2 import SingleTableMixin
 
+from ..cache import class_cache, get_query_value
+from ..preferences import PREFERENCES_STORE, get_preferences_store
+from ..search import search_queryset
 from ..viewsets.base import WithActionMixin
 from .aaa import LoginRequiredMixin, PermissionRequiredMixin
-from .list_table import table_factory
+from .conditional import ListConditionalGetMixin
+from .list_table import cached_table_factory
 from .mixins import TemplateMixin
+from .pagination import COUNT_PAGINATORS, KeysetPaginator
+from .query_plan import QueryPlan
+from .row_cache import TableRowCache
+
+logger = logging.getLogger(__name__)
+
+
+@class_cache
+def _filterset_factory(model, fields, lookups):
+    if lookups:
+        fields = {name: list(field_lookups) for name, field_lookups in fields}
+    elif isinstance(fields, tuple):
+        fields = list(fields)
+    return filterset_factory(model, fields=fields)
+
+
+def cached_filterset_factory(model, fields):
+    """filterset_factory memoized by model and fields"""
+    if isinstance(fields, dict):
+        items = tuple((name, tuple(lookups)) for name, lookups in fields.items())
+        return _filterset_factory(model, items, True)
+    if isinstance(fields, list):
+        fields = tuple(fields)
+    return _filterset_factory(model, fields, False)
 
 
 class FilterMixin(BaseFilterMixin):
+    # fields with row counts shown in their filter choices
+    facet_fields = []
+    # seconds facet counts are cached, by filter state, None to not cache
+    facet_cache_timeout = None
+
+    def get_filterset_class(self):
+        if not self.filterset_class and self.model:
+            return cached_filterset_factory(self.model, self.filterset_fields)
+        return super().get_filterset_class()
+
     @cached_property
     def filterset(self):
         filterset_class = self.get_filterset_class()
         if filterset_class:
             return self.get_filterset(filterset_class)
 
+    def get_filterset(self, filterset_class):
+        filterset = super().get_filterset(filterset_class)
+        for name in self.get_facet_fields():
+            if name in filterset.form.fields:
+                self.add_facet_counts(filterset.form.fields[name], name)
+        return filterset
+
     def get_filtered_queryset(self):
         if self.filterset:
             return self.filterset.qs
         return self.get_queryset()
 
+    def get_facet_fields(self):
+        return self.facet_fields
+
+    def get_facet_counts(self, queryset, name):
+        """Return (value, count) pairs of field in queryset, in one query"""
+        counts = (
+            queryset.order_by()
+            .values_list(name)
+            .annotate(facet_count=models.Count("pk", distinct=True))
+        )
+        if self.facet_cache_timeout is None:
+            return list(counts)
+        return get_query_value(
+            counts, "facets", lambda: list(counts), self.facet_cache_timeout
+        )
+
+    @cached_property
+    def facets(self):
+        """Row count by value of each facet field, in filtered queryset"""
+        queryset = self.get_filtered_queryset()
+        return {
+            name: dict(self.get_facet_counts(queryset, name))
+            for name in self.get_facet_fields()
+        }
+
+    @cached_property
+    def _facets_by_str(self):
+        # form choices values are strings
+        return {
+            name: {str(value): count for value, count in counts.items()}
+            for name, counts in self.facets.items()
+        }
+
+    def get_facet_label(self, label, name, value):
+        count = self._facets_by_str[name].get(str(value), 0)
+        return f"{label} ({count})"
+
+    def add_facet_counts(self, field, name):
+        """Add counts to field choices labels, computed when rendered"""
+        facet_label = lazy(self.get_facet_label, str)
+        if isinstance(field, forms.ModelChoiceField):
+            label_from_instance = field.label_from_instance
+            field.label_from_instance = lambda obj: facet_label(
+                label_from_instance(obj), name, obj.pk
+            )
+        elif isinstance(field, forms.NullBooleanField):
+            values = {"true": True, "false": False}
+            field.widget.choices = [
+                (key, facet_label(label, name, values[key]) if key in values else label)
+                for key, label in field.widget.choices
+            ]
+        elif isinstance(field, forms.ChoiceField):
+            # empty and null choices are added back by django-filter fields
+            skip = {"", None, getattr(field, "null_value", None)}
+            field.choices = [
+                (value, label if value in skip else facet_label(label, name, value))
+                for value, label in field.choices
+                if not hasattr(field, "iterator") or value not in skip
+            ]
+
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
@@ -34,6 +145,23 @@ class FilterMixin(BaseFilterMixin):
 class FilteredSingleTableMixin(FilterMixin, SingleTableMixin):
     list_display = None
     filterset_fields = []
+    # "offset" for numbered pages, "keyset" for prev/next pages seeking by cursor
+    pagination_mode = "offset"
+    cursor_kwarg = "cursor"
+    # row count in offset mode: "exact", "cached", "estimate" or "none"
+    count_strategy = getattr(settings, "CLASSY_ADMIN_COUNT_STRATEGY", "exact")
+    count_cache_timeout = 60
+    # page sizes offered to users, others are ignored
+    page_sizes = (10, 25, 50)
+    # join, prefetch and load only what the table displays
+    auto_query_plan = True
+    query_plan = None
+    # "session", "cache", "dynamic_preferences", or a PreferencesStore class
+    # or dotted path
+    preferences_store = PREFERENCES_STORE
+    # cache rendered rows cells, by the row version_field
+    row_cache = False
+    row_cache_timeout = 300
 
     def get_list_display(self):
         return self.list_display
@@ -41,21 +169,96 @@ class FilteredSingleTableMixin(FilterMixin, SingleTableMixin):
     def get_table_class(self):
         if not self.table_class:
             default_action = self.actions.item_default
-            return table_factory(
+            list_display = self.get_list_display()
+            return cached_table_factory(
                 self.model,
-                self.get_list_display(),
+                tuple(list_display) if list_display is not None else None,
                 url_name=default_action.url_name if default_action else None,
             )
         return super().get_table_class()
 
+    def get_query_plan(self, table_class, queryset, extra_columns=()):
+        columns = {
+            name: column.accessor or name
+            for name, column in table_class.base_columns.items()
+            if name not in table_class._meta.exclude
+        }
+        # custom columns and checks may use any field of the rows
+        restrict_fields = (
+            not self.table_class
+            and all(name in ("actions", "selection") for name, _ in extra_columns)
+            and not any(a.check or a.check_many for a in self.actions.item.values())
+        )
+        return QueryPlan.from_paths(
+            self.model,
+            columns.values(),
+            ordering=queryset.query.order_by or self.model._meta.ordering,
+            restrict_fields=restrict_fields,
+            fields=self.get_query_plan_fields(),
+        )
+
+    def get_query_plan_fields(self) -> list[str]:
+        """Fields loaded with the displayed ones, like the version of rows"""
+        version_field = getattr(self, "version_field", None)
+        if version_field and (self.row_cache or getattr(self, "conditional_get", None)):
+            return [version_field]
+        return []
+
     def get_table(self, **kwargs):
-        table = super().get_table(**kwargs)
+        table = self.build_table(**kwargs)
+        pagination = self.get_table_pagination(table)
+        if pagination:
+            self.paginate_table(table, pagination)
+        return self.finalize_table(table)
+
+    def finalize_table(self, table):
+        """Prepare paginated table for rendering"""
+        if any(a.check_many for a in self.actions.item.values()):
+            # check all page objects at once
+            self.actions.check_objects(row.record for row in table.paginated_rows)
+        if self.row_cache and getattr(self, "version_field", None):
+            table.row_cache = TableRowCache(table, self, self.row_cache_timeout)
+        self.preferences.save()
+        return table
+
+    def build_table(self, **kwargs):
+        """Return table of filtered and ordered rows, not paginated"""
+        table_class = self.get_table_class()
+        data = self.get_table_data()
+        if self.auto_query_plan and isinstance(data, models.QuerySet):
+            self.query_plan = self.get_query_plan(
+                table_class, data, kwargs.get("extra_columns", ())
+            )
+            logger.debug("%s query plan: %r", type(self).__name__, self.query_plan)
+            data = self.query_plan.apply(data)
+        table = table_class(data=data, **kwargs)
+        table.request = self.request
+        # order before paginating, so saved ordering applies to current page
         table.order_by = self.get_table_order_by(table)
         return table
 
+    def paginate_table(self, table, pagination):
+        try:
+            table.paginate(**pagination)
+        except PageNotAnInteger:
+            table.page = table.paginator.page(1)
+        except EmptyPage:
+            # last page, or the first one when the last is unknown, not counted
+            table.page = table.paginator.page(table.paginator.num_pages or 1)
+
     def get_table_pagination(self, table):
         pagination = super().get_table_pagination(table)
-        updates = {"page": self.request.GET.get("page")}
+        if self.pagination_mode == "keyset":
+            updates = {
+                "paginator_class": KeysetPaginator,
+                "page": self.request.GET.get(self.cursor_kwarg),
+            }
+        else:
+            updates = {"page": self.request.GET.get("page")}
+            if self.count_strategy != "exact":
+                updates["paginator_class"] = COUNT_PAGINATORS[self.count_strategy]
+            if self.count_strategy == "cached":
+                updates["cache_timeout"] = self.count_cache_timeout
         if not isinstance(pagination, dict):
             pagination = {}
         pagination.update(updates)
@@ -64,42 +267,59 @@ class FilteredSingleTableMixin(FilterMixin, SingleTableMixin):
     def get_table_data(self):
         return self.get_filtered_queryset()
 
+    def paginate_queryset(self, queryset, page_size):
+        # table paginates itself, avoid counting and slicing object_list twice
+        return None, None, queryset, False
+
     def get_paginate_by(self, queryset):
-        per_page = self.request.GET.get("per_page", None)
-        if per_page is not None:
-            self.request.session["per_page"] = per_page
-        return self.request.session.get("per_page", self.paginate_by)
+        per_page = self.request.GET.get("per_page", "")
+        if per_page.isdigit() and int(per_page) in self.page_sizes:
+            self.preferences.set("per_page", int(per_page))
+        per_page = self.preferences.get("per_page")
+        return per_page if per_page in self.page_sizes else self.paginate_by
+
+    def get_preferences_key(self):
+        """Key user preferences of the list, like ordering, are saved under"""
+        if self.action:
+            return self.action.url_name
+        return self.request.path
+
+    @cached_property
+    def preferences(self):
+        return get_preferences_store(
+            self.preferences_store, self.request, self.get_preferences_key()
+        )
 
     def get_table_order_by(self, table):
-        order_key = f"user-settings/{self.request.path}/order"
         req_order_by = self.request.GET.getlist(table.prefixed_order_by_field)
-        if not req_order_by:
-            req_order_by = []
-        saved_order_by = self.request.session.get(order_key, [])
+        saved_order_by = self.preferences.get("order", [])
         new_order_by = req_order_by + [
             f
             for f in saved_order_by
             if f not in req_order_by and f"-{f}" not in req_order_by
         ]
-        self.request.session[order_key] = new_order_by
+        if req_order_by:
+            self.preferences.set("order", new_order_by)
         return new_order_by
 
 
 class SearchMixin:
     search_fields = []
+    # "icontains", "postgres", "sqlite", "fulltext" (matching the database),
+    # or a SearchBackend class or dotted path
+    search_backend = getattr(settings, "CLASSY_ADMIN_SEARCH_BACKEND", "icontains")
+    search_kwarg = "search"
+
+    def get_search_term(self):
+        return self.request.GET.get(self.search_kwarg, "")
 
     def filter_queryset(self, queryset):
-        orm_lookups = [
-            f"{str(search_field)}__icontains" for search_field in self.search_fields
-        ]
-        or_query = models.Q()
-        search_term = self.request.GET.get("search", "")
-        for bit in smart_split(search_term):
-            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
-                bit = unescape_string_literal(bit)
-            for orm_lookup in orm_lookups:
-                or_query |= models.Q((orm_lookup, bit))
-        return queryset.filter(or_query)
+        search_term = self.get_search_term()
+        if not search_term or not self.search_fields:
+            return queryset
+        return search_queryset(
+            self.search_backend, queryset, self.search_fields, search_term
+        )
 
     def get_queryset(self):
         return self.filter_queryset(super().get_queryset())
@@ -137,6 +357,7 @@ class TableListView(
     WithActionMixin,
     LoginRequiredMixin,
     PermissionRequiredMixin,
+    ListConditionalGetMixin,
     FilteredSingleTableMixin,
     SearchMixin,
     TemplateMixin,
@@ -144,9 +365,21 @@ class TableListView(
 ):
     template_name_suffix = "_list"
     paginate_by = 10
+    # refresh the table on changes of rows, streamed by the events action,
+    # keeping a connection open by page, best served by ASGI
+    live_updates = getattr(settings, "CLASSY_ADMIN_LIVE_UPDATES", False)
+
+    def get_events_url(self):
+        viewset = getattr(self, "viewset", None)
+        if not self.live_updates or viewset is None:
+            return None
+        action = viewset.bound_actions.get("events")
+        if action is not None:
+            return reverse(action.url_name)
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             page_title=self.model._meta.verbose_name_plural.capitalize(),
+            events_url=self.get_events_url(),
             **kwargs,
         )
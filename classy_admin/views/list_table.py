@@ -2,6 +2,9 @@ from django.db.models import Model
 from django_tables2 import columns, tables
 from django_tables2.utils import Accessor
 
+from ..cache import class_cache
+from ..viewsets.actions import reverse_object_url
+
 
 def table_factory(model: Model, fields=None, url_name=None, extra_attrs=None):
     attrs = {"Meta": type("Meta", (object,), {"model": model, "fields": fields})}
@@ -26,9 +29,18 @@ def table_factory(model: Model, fields=None, url_name=None, extra_attrs=None):
         field = Accessor(linked_field).get_field(model)
         column = columns.library.column_for_field(field)
         column_type = type(column)
-        link = (url_name, {"pk": Accessor("pk")})
+
+        def link(record):
+            return reverse_object_url(url_name, record.pk)
+
         attrs.update({linked_field: column_type(linkify=link)})
 
     if extra_attrs is not None:
         attrs.update(extra_attrs)
     return type("%sTable" % model._meta.object_name, (tables.Table,), attrs)
+
+
+@class_cache
+def cached_table_factory(model: Model, fields: tuple = None, url_name=None):
+    """table_factory memoized by model, fields and url_name"""
+    return table_factory(model, fields, url_name)
@@ -1,6 +1,8 @@
 from crispy_forms.helper import FormHelper
+from django.conf import settings
 from django.contrib import messages
 from django.db.models.base import ModelBase
+from django.utils.cache import patch_vary_headers
 
 from ..views.responses import TemplateBlockResponse
 from ..viewsets.actions import Action
@@ -13,14 +15,24 @@ __all__ = ("LoginRequiredMixin", "PermissionRequiredMixin")
 class TemplateMixin:
     response_class = TemplateBlockResponse
     default_template_block = "content"
+    # links in layout fetch only the main block of pages, with htmx boost
+    boosted_navigation = getattr(settings, "CLASSY_ADMIN_BOOSTED_NAVIGATION", False)
 
     def render_to_response(self, context, **response_kwargs):
         response: TemplateBlockResponse = super().render_to_response(
             context, **response_kwargs
         )
         response.template_block = self.default_template_block
+        response.boosted_navigation = self.boosted_navigation
+        if self.boosted_navigation:
+            patch_vary_headers(response, ["HX-Request", "HX-Boosted"])
         return response
 
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            **kwargs, boosted_navigation=self.boosted_navigation
+        )
+
     def get_template_names(self):
         templates_names = super().get_template_names()
         suffix = getattr(self, "template_name_suffix", None)
@@ -69,6 +81,20 @@ class FormHelperMixin(SuccessMessageMixin):
         return form
 
 
+class SingleObjectCacheMixin:
+    """
+    Fetch object once per request, so permission checks, view, breadcrumbs
+    and item actions checks share the same instance.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if "_object_cache" not in self.__dict__:
+            self._object_cache = super().get_object()
+        return self._object_cache
+
+
 class PageTitleMixin:
     def get_page_title(self):
         if self.page_title:
@@ -0,0 +1,329 @@
+import json
+from math import ceil
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections
+from django.db.models import F, OrderBy, Q, QuerySet
+from django.utils.functional import cached_property
+from django_tables2.paginators import LazyPaginator
+from django_tables2.rows import BoundRows
+
+from ..cache import get_query_value
+
+CURSOR_SALT = "classy_admin.pagination.cursor"
+# below this, estimates are unreliable and exact counts are cheap
+ESTIMATE_THRESHOLD = getattr(settings, "CLASSY_ADMIN_COUNT_ESTIMATE_THRESHOLD", 10000)
+
+
+def get_queryset(object_list):
+    """Return queryset of paginated table rows, or None"""
+    data = getattr(getattr(object_list, "data", None), "data", object_list)
+    return data if isinstance(data, QuerySet) else None
+
+
+def estimate_count(queryset):
+    """Return query planner estimate of queryset rows, or None if not available"""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    queryset = queryset.order_by()
+    try:
+        with connection.cursor() as cursor:
+            if not queryset.query.has_filters():
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+                # tables never analyzed have no estimate
+                if row and row[0] >= 0:
+                    return row[0]
+            sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator caching row count of the query. Cached counts expire after
+    cache_timeout or when a table used by the query is changed.
+    """
+
+    count_strategy = "cached"
+
+    def __init__(self, object_list, per_page, cache_timeout=60, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_timeout = cache_timeout
+
+    @cached_property
+    def count(self):
+        queryset = get_queryset(self.object_list)
+        if queryset is None:
+            return super().count
+        queryset = queryset.order_by()
+        return get_query_value(queryset, "count", queryset.count, self.cache_timeout)
+
+
+class UncountedPage(Page):
+    def has_next(self):
+        # known from rows fetched ahead, not from count
+        return self.number < (self.paginator._num_pages or 0)
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.paginator.per_page * (self.number - 1)) + 1
+
+    def end_index(self):
+        if not self.object_list:
+            return 0
+        return self.start_index() + len(self.object_list) - 1
+
+
+class UncountedPaginator(LazyPaginator):
+    """Paginator not counting rows, next page is detected fetching one more row"""
+
+    count_strategy = "none"
+
+    def page(self, number):
+        page = super().page(number)
+        return UncountedPage(page.object_list, page.number, self)
+
+
+class EstimatedCountPaginator(UncountedPaginator):
+    """
+    Paginator using query planner row estimate as count, when available and
+    large enough, otherwise rows are counted.
+    """
+
+    count_strategy = "estimate"
+    count_exceeded = False
+
+    @cached_property
+    def count_is_estimate(self):
+        return self._estimate is not None
+
+    @cached_property
+    def _estimate(self):
+        queryset = get_queryset(self.object_list)
+        if queryset is None:
+            return None
+        estimate = estimate_count(queryset)
+        if estimate is None or estimate < ESTIMATE_THRESHOLD:
+            return None
+        return int(estimate)
+
+    @cached_property
+    def count(self):
+        if self._estimate is None:
+            return len(self.object_list)
+        return self._estimate
+
+    def page(self, number):
+        try:
+            page = super().page(number)
+        except EmptyPage:
+            # estimate is past the last row, where it is remains unknown
+            self.count_exceeded = True
+            raise
+        if self._final_num_pages and self.count_is_estimate:
+            # last page reached, count is known
+            self.count = page.end_index()
+            self.count_is_estimate = False
+        return page
+
+    @property
+    def num_pages(self):
+        if self._final_num_pages or self.count_exceeded:
+            return self._num_pages
+        return max(self._num_pages or 1, ceil(self.count / self.per_page))
+
+
+COUNT_PAGINATORS = {
+    "exact": Paginator,
+    "cached": CachedCountPaginator,
+    "estimate": EstimatedCountPaginator,
+    "none": UncountedPaginator,
+}
+
+
+class CursorSerializer(signing.JSONSerializer):
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), cls=DjangoJSONEncoder).encode(
+            "latin-1"
+        )
+
+
+def get_ordering_keys(queryset):
+    """Return (field, descending) pairs of queryset ordering, ending with pk"""
+    ordering = queryset.query.order_by
+    if not ordering and queryset.query.default_ordering:
+        ordering = queryset.model._meta.ordering
+    keys = []
+    for item in ordering:
+        if isinstance(item, str):
+            if item == "?":
+                raise ImproperlyConfigured("Keyset pagination needs stable ordering.")
+            field, descending = item.lstrip("-"), item.startswith("-")
+        elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+            if item.nulls_first or item.nulls_last:
+                raise ImproperlyConfigured(
+                    "Keyset pagination does not support explicit nulls ordering."
+                )
+            field, descending = item.expression.name, item.descending
+        else:
+            raise ImproperlyConfigured(
+                f"Keyset pagination does not support ordering by {item!r}."
+            )
+        if field == queryset.model._meta.pk.name:
+            field = "pk"
+        keys.append((field, descending))
+        if field == "pk":
+            break
+    else:
+        keys.append(("pk", False))
+    return keys
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, cursor, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __repr__(self):
+        return f"<KeysetPage {self.cursor or 'first'}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    @cached_property
+    def next_cursor(self):
+        if self._has_next:
+            return self.paginator.make_cursor(self.object_list.data[-1], "next")
+
+    @cached_property
+    def previous_cursor(self):
+        if self._has_previous:
+            return self.paginator.make_cursor(self.object_list.data[0], "previous")
+
+
+class KeysetPaginator:
+    """
+    Paginate table rows seeking from the last row seen, instead of using
+    OFFSET, so any page costs the same as the first one and no COUNT is done.
+
+    Rows are ordered by the queryset ordering followed by pk. Pages are
+    addressed by opaque signed cursors holding the ordering values of the
+    row next to the page boundary.
+    """
+
+    keyset = True
+
+    def __init__(self, object_list, per_page, orphans=0, **kwargs):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        queryset = object_list.data.data
+        self.keys = get_ordering_keys(queryset)
+        self.aliases = [f"_keyset_{i}" for i in range(len(self.keys))]
+        self.queryset = queryset.annotate(
+            **{alias: F(field) for alias, (field, _) in zip(self.aliases, self.keys)}
+        )
+        self.nulls_order_largest = connections[queryset.db].features.nulls_order_largest
+        self.nullable = [
+            # values across relations may be null due to outer joins
+            "__" in field or self.queryset.query.annotations[alias].output_field.null
+            for alias, (field, _) in zip(self.aliases, self.keys)
+        ]
+
+    def make_cursor(self, record, direction):
+        values = [getattr(record, alias) for alias in self.aliases]
+        return signing.dumps(
+            {"k": self.keys, "v": values, "d": direction},
+            salt=CURSOR_SALT,
+            serializer=CursorSerializer,
+            compress=True,
+        )
+
+    def load_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, ValueError, TypeError):
+            return None
+        # ordering changed since cursor was made
+        if [tuple(key) for key in data.get("k", [])] != self.keys:
+            return None
+        return data
+
+    def seek(self, values, reverse):
+        """Filter rows after values, in ordering direction or reversed"""
+        query = Q(pk__in=[])
+        equal = Q()
+        for alias, (_, descending), nullable, value in zip(
+            self.aliases, self.keys, self.nullable, values
+        ):
+            descending = descending != reverse
+            nulls_last = nullable and self.nulls_order_largest != descending
+            if value is None:
+                # nulls are equal, rows after are the not null ones, if any
+                after = Q(pk__in=[]) if nulls_last else Q((f"{alias}__isnull", False))
+                query |= equal & after
+                equal &= Q((f"{alias}__isnull", True))
+            else:
+                lookup = "lt" if descending else "gt"
+                after = Q((f"{alias}__{lookup}", value))
+                if nulls_last:
+                    after |= Q((f"{alias}__isnull", True))
+                query |= equal & after
+                equal &= Q((alias, value))
+        return query
+
+    def ordering(self, reverse):
+        return [
+            OrderBy(F(alias), descending=descending != reverse)
+            for alias, (_, descending) in zip(self.aliases, self.keys)
+        ]
+
+    def page(self, cursor):
+        data = self.load_cursor(cursor) if cursor else None
+        reverse = bool(data) and data["d"] == "previous"
+        queryset = self.queryset.order_by(*self.ordering(reverse))
+        if data:
+            queryset = queryset.filter(self.seek(data["v"], reverse))
+        records = list(queryset[: self.per_page + 1])
+        has_more = len(records) > self.per_page
+        records = records[: self.per_page]
+        if reverse:
+            records.reverse()
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = bool(data), has_more
+        rows = BoundRows(
+            data=records,
+            table=self.object_list.table,
+            pinned_data=self.object_list.pinned_data,
+        )
+        return KeysetPage(rows, self, cursor if data else None, has_previous, has_next)
@@ -0,0 +1,115 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model
+
+
+def resolve_path(model: Model, path: str):
+    """
+    Resolve field path, like ``group__name``, into the relations it follows
+    and the final field. Field is None when path is not made of fields.
+    """
+    parts = path.replace(".", "__").split("__")
+    opts = model._meta
+    relations = []
+    for index, part in enumerate(parts):
+        try:
+            field = opts.pk if part == "pk" else opts.get_field(part)
+        except FieldDoesNotExist:
+            return relations, None
+        if field.is_relation and field.related_model:
+            relations.append(field)
+            opts = field.related_model._meta
+        elif field.is_relation or index < len(parts) - 1:
+            # generic relation or attribute of a plain field
+            return relations, None
+    return relations, field
+
+
+class QueryPlan:
+    """Related lookups and columns needed to render the rows of a table"""
+
+    def __init__(self, select_related=(), prefetch_related=(), only=None):
+        self.select_related = list(select_related)
+        self.prefetch_related = list(prefetch_related)
+        self.only = only
+
+    def __repr__(self):
+        return (
+            f"<QueryPlan select_related={self.select_related} "
+            f"prefetch_related={self.prefetch_related} only={self.only}>"
+        )
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related or self.only)
+
+    @classmethod
+    def from_paths(
+        cls, model: Model, paths, ordering=(), restrict_fields=True, fields=()
+    ):
+        """
+        Plan the query for displaying field paths. Forward relations are
+        joined, many-valued relations prefetched and, if restrict_fields and
+        all paths are fields, only the displayed and ordering columns, and
+        the own fields named in fields, loaded.
+        """
+        select_related, prefetch_related, only = set(), set(), set()
+        # related objects used as a whole, all their columns are loaded
+        loaded = set()
+        for path in paths:
+            relations, field = resolve_path(model, path)
+            if field is None:
+                restrict_fields = False
+            names = [relation.name for relation in relations]
+            for index, relation in enumerate(relations):
+                if relation.many_to_many or relation.one_to_many:
+                    prefetch_related.add(
+                        "__".join(
+                            # reverse relations are prefetched by accessor name
+                            getattr(
+                                relation, "get_accessor_name", lambda name=name: name
+                            )()
+                            for relation, name in zip(relations, names)
+                        )
+                    )
+                    names = names[:index]
+                    if names:
+                        # prefetch follows from a fully loaded related object
+                        loaded.add("__".join(names))
+                    break
+            else:
+                if field is not None and not field.is_relation:
+                    only.add("__".join([*names, field.name]))
+                elif field is not None:
+                    loaded.add("__".join(names))
+            if names:
+                select_related.add("__".join(names))
+        # only own columns are needed to order rows
+        orders = [order.lstrip("-") for order in ordering if isinstance(order, str)]
+        for path in [*orders, *fields]:
+            relations, field = resolve_path(model, path)
+            if field is not None and not relations:
+                only.add(field.name)
+        # drop lookups implied by longer ones
+        select_related = {
+            lookup
+            for lookup in select_related
+            if not any(other.startswith(f"{lookup}__") for other in select_related)
+        }
+        only = {
+            path
+            for path in only
+            if not any(path.startswith(f"{prefix}__") for prefix in loaded)
+        }
+        return cls(
+            sorted(select_related),
+            sorted(prefetch_related),
+            sorted(only | loaded | {model._meta.pk.name}) if restrict_fields else None,
+        )
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
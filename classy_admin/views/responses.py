@@ -1,20 +1,116 @@
+from weakref import WeakKeyDictionary
+
+from django.template.context import make_context
+from django.template.loader_tags import (
+    BLOCK_CONTEXT_KEY,
+    BlockContext,
+    BlockNode,
+    ExtendsNode,
+)
 from django.template.response import TemplateResponse
-from render_block.django import django_render_block
+from render_block.exceptions import BlockNotFound
+
+# block nodes of templates and their parents, by compiled template, so they
+# are dropped with templates when the loader cache is reset
+_template_blocks = WeakKeyDictionary()
+
+
+def get_template_blocks(template, context) -> list[dict[str, BlockNode]]:
+    """
+    Return block nodes of template and of its parents, in inheritance
+    order. Cached when parents are named by constant strings.
+    """
+    blocks = _template_blocks.get(template)
+    if blocks is not None:
+        return blocks
+    blocks, static = [], True
+    current = template
+    while current is not None:
+        nodelist = current.nodelist
+        blocks.append({n.name: n for n in nodelist.get_nodes_by_type(BlockNode)})
+        extends = nodelist.get_nodes_by_type(ExtendsNode)
+        if not extends:
+            break
+        parent_name = extends[0].parent_name
+        static = static and isinstance(parent_name.var, str) and not parent_name.filters
+        current = extends[0].get_parent(context)
+    if static:
+        _template_blocks[template] = blocks
+    return blocks
+
+
+def render_blocks(template, block_names, context, request=None) -> dict[str, str]:
+    """Render blocks of a template, with its inheritance, like render_block"""
+    template = template.template
+    context = make_context(context, request)
+    with (
+        context.render_context.push_state(template),
+        context.bind_template(template),
+    ):
+        block_context = context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+        for blocks in get_template_blocks(template, context):
+            block_context.add_blocks(blocks)
+        rendered = {}
+        for block_name in block_names:
+            block_node = block_context.get_block(block_name)
+            if block_node is None:
+                raise BlockNotFound(f"block with name '{block_name}' does not exist")
+            rendered[block_name] = block_node.render(context)
+        return rendered
+
+
+def render_block(template, block_name, context, request=None) -> str:
+    return render_blocks(template, [block_name], context, request)[block_name]
 
 
 class TemplateBlockResponse(TemplateResponse):
     template_block = "content"
+    boosted_navigation = False
+    # block replacing the main element of layout in boosted navigation
+    navigation_block = "layout_main"
+
+    def is_navigation(self):
+        return (
+            self.boosted_navigation
+            and self._request.headers.get("HX-Boosted") == "true"
+        )
+
+    def render_navigation(self, template, context):
+        """
+        Render the main block of page, swapped in by htmx, with the page title
+        and the blocks out of main element of layout updated out of band.
+        """
+        try:
+            blocks = render_blocks(
+                template,
+                [self.navigation_block, "title", "afterlayout", "messages"],
+                context,
+                self._request,
+            )
+        except BlockNotFound:
+            # pages out of layout, like login, are loaded in full
+            self.headers["HX-Redirect"] = self._request.get_full_path()
+            return ""
+        return (
+            f"{blocks[self.navigation_block]}"
+            f"<title>{blocks['title'].strip()}</title>"
+            f'<div id="app-afterlayout" hx-swap-oob="true">'
+            f"{blocks['afterlayout']}</div>"
+            f"{blocks['messages']}"
+        )
 
     @property
     def rendered_content(self):
         template = self.resolve_template(self.template_name)
         context = self.resolve_context(self.context_data)
         template_block = self._request.GET.get("_renderblock", None)
+        if not template_block and self.is_navigation():
+            return self.render_navigation(template, context)
         # requests with htmx set content as default block name
         if getattr(self._request, "htmx", None) and not template_block:
             template_block = self.template_block
         if template_block:  # render template block only
-            return django_render_block(template, template_block, context, self._request)
+            return render_block(template, template_block, context, self._request)
 
         # full template render
         return template.render(context, self._request)
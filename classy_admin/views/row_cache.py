@@ -0,0 +1,80 @@
+import hashlib
+
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from ..cache import KEY_PREFIX, get_cache, get_permissions_fingerprint
+
+ROW_TEMPLATE = "list/_table_row.html"
+
+
+def render_row_cells(context, row):
+    """Render cells of table row with the row template"""
+    template = context.template.engine.get_template(ROW_TEMPLATE)
+    with context.push(row=row):
+        return template.render(context)
+
+
+class TableRowCache:
+    """
+    Cache of rendered table row cells, by row version. Cached rows of the
+    page are read at once, only missing rows are rendered, and written
+    together after the last row of the page.
+    """
+
+    def __init__(self, table, view, timeout=None):
+        self.table = table
+        self.view = view
+        self.version_field = view.version_field
+        self.timeout = timeout
+        self.cached = None
+        self.missing = {}
+        self.remaining = 0
+
+    @cached_property
+    def key_prefix(self):
+        table_class = type(self.table)
+        return "|".join(
+            [
+                f"{table_class.__module__}.{table_class.__qualname__}",
+                ",".join(column.name for column in self.table.columns),
+                get_language() or "",
+                timezone.get_current_timezone_name(),
+                # actions column shows actions allowed for user
+                get_permissions_fingerprint(self.view.request.user),
+            ]
+        )
+
+    @cached_property
+    def checks_objects(self):
+        return any(a.check_many for a in self.view.actions.item.values())
+
+    def get_key(self, record):
+        parts = [self.key_prefix, record.pk, getattr(record, self.version_field)]
+        if self.checks_objects:
+            parts.append(",".join(self.view.actions.for_object(record)))
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False)
+        return f"{KEY_PREFIX}:row:{digest.hexdigest()}"
+
+    def get_records(self):
+        # records, not bound rows, as rows creation advances the row counter
+        if self.table.page:
+            return self.table.page.object_list.data
+        return self.table.data
+
+    def render(self, context, row):
+        if self.cached is None:
+            keys = [self.get_key(record) for record in self.get_records()]
+            self.remaining = len(keys)
+            self.cached = get_cache().get_many(keys)
+        key = self.get_key(row.record)
+        html = self.cached.get(key)
+        if html is None:
+            html = self.missing[key] = render_row_cells(context, row)
+        self.remaining -= 1
+        if self.remaining == 0 and self.missing:
+            get_cache().set_many(self.missing, self.timeout)
+            self.missing = {}
+        return mark_safe(html)
@@ -1,10 +1,18 @@
-from collections.abc import Callable
-from types import SimpleNamespace
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
+from itertools import product
+from types import MappingProxyType, SimpleNamespace
 from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import quote
 
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.db.models.options import Options
 from django.http import HttpRequest, HttpResponse
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+from ..cache import KEY_PREFIX
 
 if TYPE_CHECKING:
     from .base import ViewSet
@@ -50,9 +58,35 @@ ACTIONS_TEMPLATES: dict[dict] = {
         css_class="btn-light-danger",
         order=100,
     ),
+    "export": dict(
+        item=False,
+        default=False,
+        verbose_name="exportar",
+        icon="ki-outline ki-exit-down",
+        perm="view",
+        order=90,
+    ),
+    "bulk_delete": dict(
+        item=False,
+        bulk=True,
+        default=False,
+        modal=True,
+        verbose_name="excluir selecionados",
+        icon="ki-outline ki-trash",
+        perm="delete",
+        css_class="btn-light-danger",
+        order=100,
+    ),
+    "events": dict(
+        item=False,
+        default=False,
+        hidden=True,
+        verbose_name="eventos",
+        perm="view",
+    ),
     None: dict(
         item=False,
-        batch=False,
+        bulk=False,
         default=False,
         hidden=False,
         tab=False,
@@ -64,6 +98,70 @@ ACTIONS_TEMPLATES: dict[dict] = {
 # action aliases
 ACTIONS_TEMPLATES.update({"edit": ACTIONS_TEMPLATES["change"]})
 
+# request attribute used to memoize allowed actions
+ACTIONS_CACHE_ATTR = "_classy_admin_actions"
+
+# action attributes indexed by ActionTable
+ACTIONS_INDEX_ATTRS = ("item", "tab", "bulk", "default", "hidden")
+
+
+# placeholder replaced by object pk in url templates
+URL_PK_PLACEHOLDER = "__pk__"
+
+
+@lru_cache(maxsize=1024)
+def _object_url_template(url_name: str, urlconf, script_prefix: str) -> str | None:
+    try:
+        return reverse(url_name, kwargs={"pk": URL_PK_PLACEHOLDER}, urlconf=urlconf)
+    except NoReverseMatch:
+        return None
+
+
+def clear_url_templates(*, setting, **kwargs):
+    # urls change without urlconf key, as get_urlconf() is None in tests
+    if setting == "ROOT_URLCONF":
+        _object_url_template.cache_clear()
+
+
+setting_changed.connect(clear_url_templates, dispatch_uid=f"{KEY_PREFIX}:url-templates")
+
+
+def reverse_object_url(url_name: str, pk) -> str:
+    """
+    Same as reverse(url_name, args=[pk]), but url is reversed once into a
+    template and the quoted pk is substituted on each call.
+    """
+    template = _object_url_template(url_name, get_urlconf(), get_script_prefix())
+    pk = str(pk)
+    if template is None or "/" in pk:
+        return reverse(url_name, args=[pk])
+    return template.replace(
+        URL_PK_PLACEHOLDER, quote(pk, safe=RFC3986_SUBDELIMS + "~:@")
+    )
+
+
+def get_request_cache(request: HttpRequest) -> dict:
+    """Actions cache bound to the request and its user"""
+    user = getattr(request, "user", None)
+    cache = getattr(request, ACTIONS_CACHE_ATTR, None)
+    if cache is None or cache["user"] is not user:
+        # user changed (login/logout), drop computed actions
+        cache = {"user": user, "actions": {}, "objects": {}}
+        setattr(request, ACTIONS_CACHE_ATTR, cache)
+    return cache
+
+
+def check_object(action: "Action", request: HttpRequest, obj) -> bool:
+    """
+    Check if action is allowed for object, using the results of
+    ActionsManager.check_objects when the object was checked in batch.
+    """
+    checked = get_request_cache(request)["objects"].get(action.url_name)
+    if checked is not None and obj.pk in checked:
+        return checked[obj.pk]
+    check_func = action.check or Action.check
+    return check_func(action, request, obj)
+
 
 class Action(SimpleNamespace):
     """
@@ -71,7 +169,8 @@ class Action(SimpleNamespace):
 
     This class defines the structure and behavior of actions that can be performed
     in an administrative or management interface, with support for item-level and
-    bulk operations, permissions, and dynamic URL generation.
+    bulk operations, permissions, and dynamic URL generation. Actions are
+    read-only once finalized by the action table of their viewset.
 
     Attributes:
         name (str): Unique identifier for the action.
@@ -87,6 +186,8 @@ class Action(SimpleNamespace):
         icon (str, optional): Icon identifier for the action.
         order (int, optional): Sorting order for the action.
         check (Callable): Function to determine if the action is visible.
+        check_many (Callable, optional): Function to check many objects at once,
+            returns the primary keys of allowed objects.
     """
 
     name: str
@@ -102,6 +203,7 @@ class Action(SimpleNamespace):
     icon: str = None
     order: int = None
     check: Callable[[Self, HttpRequest, Any | None], bool]
+    check_many: Callable[[Self, HttpRequest, Iterable], Iterable] = None
     url: str
     view_class: type["WithActionMixin"]
     view: Callable[[HttpRequest], HttpResponse]
@@ -109,14 +211,18 @@ class Action(SimpleNamespace):
 
     @property
     def url_name(self) -> str:
+        if "_url_name" in self.__dict__:
+            return self._url_name
         names = []
-        if self.viewset.namespace:
+        if getattr(self.viewset, "namespace", None):
             names.append(self.viewset.namespace)
         names.append(self.get_url_name())
         return ":".join(names)
 
     @property
     def perm_name(self):
+        if "_perm_name" in self.__dict__:
+            return self._perm_name
         perm = self.perm or self.name
         if self.viewset.model:
             meta: Options = self.viewset.model._meta
@@ -129,6 +235,11 @@ class Action(SimpleNamespace):
             return True
         return request.user.has_perm(action.perm_name, obj)
 
+    @property
+    def batch(self) -> bool:
+        """Alias of bulk"""
+        return self.bulk
+
     def __str__(self) -> str:
         return self.name
 
@@ -137,9 +248,95 @@ class Action(SimpleNamespace):
             return f"{self.viewset.name}-{self.name}"
         return self.name
 
+    def get_object_url(self, obj) -> str:
+        """Url of item action for object"""
+        return reverse_object_url(self.url_name, obj.pk)
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_finalized"):
+            raise AttributeError(f"Action {self.name} is read-only once finalized")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self.__dict__.get("_finalized"):
+            raise AttributeError(f"Action {self.name} is read-only once finalized")
+        super().__delattr__(name)
+
+    def finalize(self) -> None:
+        """Precompute url and permission names, and make action read-only"""
+        attrs = self.__dict__
+        attrs.pop("_url_name", None)
+        attrs.pop("_perm_name", None)
+        attrs.update(_url_name=self.url_name, _perm_name=self.perm_name)
+        attrs["_finalized"] = True
+
+
+class ActionTable:
+    """
+    Immutable table of viewset actions, sorted by order and indexed by
+    the boolean attributes listed in ACTIONS_INDEX_ATTRS.
+    """
+
+    __slots__ = ("_index", "actions")
+
+    def __init__(self, actions: dict[str, Action]):
+        ordered = sorted(actions.items(), key=lambda i: i[1].order or 99)
+        for _, action in ordered:
+            action.finalize()
+        index = {}
+        # one entry for each combination of True, False or any (None)
+        for key in product((None, True, False), repeat=len(ACTIONS_INDEX_ATTRS)):
+            index[key] = MappingProxyType(
+                {
+                    name: action
+                    for name, action in ordered
+                    if all(
+                        val is None or bool(getattr(action, attr, False)) == val
+                        for attr, val in zip(ACTIONS_INDEX_ATTRS, key)
+                    )
+                }
+            )
+        object.__setattr__(self, "actions", index[(None,) * len(ACTIONS_INDEX_ATTRS)])
+        object.__setattr__(self, "_index", index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {list(self.actions)}>"
+
+    def filter(self, **kwargs) -> Mapping[str, Action]:
+        """Actions matching attribute values, in order"""
+        key = []
+        for attr in ACTIONS_INDEX_ATTRS:
+            val = kwargs.pop(attr, None)
+            key.append(None if val is None else bool(val))
+        actions = self._index[tuple(key)]
+        if kwargs:
+            # attributes not indexed
+            actions = {
+                name: action
+                for name, action in actions.items()
+                if all(
+                    getattr(action, attr, False) == val for attr, val in kwargs.items()
+                )
+            }
+        return actions
+
 
 class ActionsManager:
-    view: "WithActionMixin"
+    """
+    Actions available to a view.
+
+    Used as a view class attribute, each view instance gets its own manager
+    on first access, so concurrent requests never share state.
+    """
+
+    view: "WithActionMixin" = None
+    __name__ = "actions"
+
+    def __init__(self, view: "WithActionMixin" = None):
+        self.view = view
 
     @property
     def viewset(self) -> "ViewSet":
@@ -149,34 +346,49 @@ class ActionsManager:
     def request(self):
         return self.view.request
 
-    def __get__(self, obj, obj_type=None) -> dict[str, Action]:
-        self.view = obj
-        return self
+    def __get__(self, obj, obj_type=None) -> "ActionsManager":
+        if obj is None:
+            return self
+        manager = obj.__dict__.get(self.__name__)
+        if manager is None:
+            # bind a new manager to the view instance
+            manager = obj.__dict__[self.__name__] = type(self)(obj)
+        return manager
 
     def __set_name__(self, view, name):
-        self.view = view
         self.__name__ = name
 
-    def __set__(self):
-        raise AttributeError(f"{self.attr_name} attribute can not be changed")
+    def __set__(self, obj, value):
+        raise AttributeError(f"{self.__name__} attribute can not be changed")
 
     def __repr__(self):
+        if self.view is None:
+            return f"<{self.__class__.__name__} unbound>"
         return f"<{self.__class__.__name__} of {self.viewset.__class__.__name__}({self.viewset.name})>"
 
     def registered(self) -> dict[str, Action]:
         return self.viewset.bound_actions
 
     def _allowed(self, include_hidden=False, **kwargs) -> dict[str, Action]:
+        current_action = getattr(self.view, "action", None)
+        cache_key = (
+            self.viewset,
+            current_action.name if current_action else None,
+            include_hidden,
+            tuple(sorted(kwargs.items())),
+        )
+        cache = get_request_cache(self.request)["actions"]
+        if cache_key not in cache:
+            cache[cache_key] = self._check_allowed(include_hidden, **kwargs)
+        return cache[cache_key]
+
+    def _check_allowed(self, include_hidden=False, **kwargs) -> dict[str, Action]:
+        if not include_hidden:
+            kwargs["hidden"] = False
         actions = {}
-        for name, action in self.registered().items():
-            if action.hidden and not include_hidden:
-                continue
+        for name, action in self.viewset.action_table.filter(**kwargs).items():
             if self.view and self.view.action.name == name:
                 continue
-            if not all(
-                [getattr(action, attr, False) == val for attr, val in kwargs.items()]
-            ):
-                continue
             if action.check is not None and not action.check(action, self.request):
                 continue
             if action.perm and not self.request.user.has_perm(action.perm_name):
@@ -194,13 +406,33 @@ class ActionsManager:
             )
         return default_actions[0]
 
+    def check_objects(self, objects: Iterable) -> None:
+        """Run batch checks (check_many) of item actions for objects"""
+        objects = list(objects)
+        checked = get_request_cache(self.request)["objects"]
+        for action in self.item.values():
+            if action.check_many is None:
+                continue
+            allowed = set(action.check_many(action, self.request, objects))
+            results = checked.setdefault(action.url_name, {})
+            for obj in objects:
+                results[obj.pk] = obj.pk in allowed
+
+    def for_object(self, obj) -> dict[str, Action]:
+        """Item actions allowed for object"""
+        return {
+            name: action
+            for name, action in self.item.items()
+            if action.check_many is None or check_object(action, self.request, obj)
+        }
+
     @property
     def allowed(self) -> dict[str, Action]:
         return self._allowed(include_hidden=True)
 
     @property
     def non_item(self) -> dict[str, Action]:
-        return self._allowed(item=False)
+        return self._allowed(item=False, bulk=False)
 
     @property
     def item(self) -> dict[str, Action]:
@@ -1,5 +1,4 @@
-from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 
 from django.conf import settings
 from django.db.models.base import ModelBase
@@ -9,12 +8,13 @@ from django.views.generic import View
 from simple_menu import MenuItem
 
 from ..registries import viewset_registry
-from .actions import ACTIONS_TEMPLATES, Action
+from .actions import ACTIONS_TEMPLATES, Action, ActionTable
 from .mixins import WithActionMixin
 
 
 class ViewSet:
     _actions: dict[str, Action]
+    _action_table: ActionTable = None
     model: ModelBase = None
     name: str = None
     url_prefix: str = None
@@ -56,6 +56,7 @@ class ViewSet:
         *,
         verbose_name: str = None,
         item: bool = None,
+        bulk: bool = None,
         batch: bool = None,
         default: bool = None,
         hidden: bool = None,
@@ -64,6 +65,7 @@ class ViewSet:
         perm: str = None,
         icon: str = None,
         check: Callable = None,
+        check_many: Callable = None,
         **kwargs,
     ):
         """Add action to viewset
@@ -73,7 +75,8 @@ class ViewSet:
         Keyword arguments:
                 verbose_name (str, optional): Human-readable name for the action.
                 item (bool): Whether the action applies to individual items.
-                batch (bool): Whether the action can be applied to multiple items.
+                bulk (bool): Whether the action applies to selected items of list.
+                batch (bool): Alias of bulk.
                 default (bool): Indicates if this is the default action.
                 hidden (bool): Determines if the action should be hidden from user interface.
                 tab (bool): Determines if the action displayed in tab interface.
@@ -83,12 +86,13 @@ class ViewSet:
                 icon (str, optional): Icon identifier for the action.
                 order (int, optional): Sorting order for the action.
                 check (Callable): Function to determine if the action is visible.
+                check_many (Callable): Function to check many objects at once.
         """
         kwargs.update(
             dict(
                 verbose_name=verbose_name,
                 item=item,
-                batch=batch,
+                bulk=batch if bulk is None else bulk,
                 default=default,
                 hidden=hidden,
                 tab=tab,
@@ -96,6 +100,7 @@ class ViewSet:
                 perm=perm,
                 icon=icon,
                 check=check,
+                check_many=check_many,
                 viewset=self,
             )
         )
@@ -107,6 +112,7 @@ class ViewSet:
                 name=name,
                 view_class=view_with_action(view_class),
             )
+            self._action_table = None
             return view_class
 
         return decorator
@@ -165,9 +171,9 @@ class ViewSet:
 
     def get_menu_item(self, namespace: str = None) -> MenuItem:
         """Get default action menu item"""
-        default_actions = [
-            a for _, a in self._actions.items() if a.default and not a.item
-        ]
+        default_actions = list(
+            self.action_table.filter(default=True, item=False).values()
+        )
         if len(default_actions) > 0:
             default_action = default_actions[0]
             if default_action.url_name:
@@ -193,12 +199,36 @@ class ViewSet:
             prefix = f"{self.name}/"
         return path(prefix, include(self._urlpatterns(namespace=namespace)))
 
-    @property
-    def bound_actions(self) -> dict[str, Action]:
-        return OrderedDict(
-            sorted(self._actions.items(), key=lambda i: i[1].order or 99)
+    def caches_query_values(self) -> bool:
+        """If views cache row counts, expired by versions of the model table"""
+        return any(
+            getattr(action.view_class, "count_strategy", None) == "cached"
+            or getattr(action.view_class, "facet_cache_timeout", None) is not None
+            for action in self._actions.values()
         )
 
+    def has_live_updates(self) -> bool:
+        """If views refresh on changes of the model, streamed by events"""
+        return any(
+            getattr(action.view_class, "live_updates", None) is True
+            for action in self._actions.values()
+        )
+
+    def finalize(self) -> ActionTable:
+        """Build the action table, must be called after URL generation"""
+        self._action_table = ActionTable(self._actions)
+        return self._action_table
+
+    @property
+    def action_table(self) -> ActionTable:
+        if self._action_table is None:
+            return self.finalize()
+        return self._action_table
+
+    @property
+    def bound_actions(self) -> Mapping[str, Action]:
+        return self.action_table.actions
+
 
 def view_with_action(view_class: type[View]) -> type[WithActionMixin]:
     """Decorator to add WithActionMixin to view class"""
@@ -1,8 +1,18 @@
 from django.db.models.base import ModelBase
 from django.db.models.options import Options
 
+from ..views.asynchronous import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncDetailView,
+    AsyncTableListView,
+    AsyncUpdateView,
+)
+from ..views.bulk import BulkDeleteView
 from ..views.detail import DetailView
 from ..views.edit import CreateView, DeleteView, UpdateView
+from ..views.events import EventStreamView
+from ..views.export import ExportView
 from ..views.list import TableListView
 from .actions import Action
 from .base import ViewSet
@@ -24,6 +34,42 @@ class CrudListViewMixin:
     def filterset_fields(self):
         return self.viewset.filterset_fields
 
+    @property
+    def facet_fields(self):
+        return self.viewset.facet_fields
+
+    @property
+    def conditional_get(self):
+        return self.viewset.conditional_get
+
+    @property
+    def version_field(self):
+        return self.viewset.version_field
+
+    @property
+    def row_cache(self):
+        return self.viewset.row_cache
+
+    @property
+    def pagination_mode(self):
+        return self.viewset.pagination_mode
+
+    @property
+    def count_strategy(self):
+        return self.viewset.count_strategy
+
+    @property
+    def search_fields(self):
+        return self.viewset.search_fields
+
+    @property
+    def search_backend(self):
+        return self.viewset.search_backend
+
+    @property
+    def live_updates(self):
+        return self.viewset.live_updates
+
 
 class CrudFormViewMixin:
     viewset: "CrudViewSet"
@@ -45,6 +91,18 @@ class CrudListView(CrudListViewMixin, TableListView):
     pass
 
 
+class CrudExportView(CrudListViewMixin, ExportView):
+    pass
+
+
+class CrudBulkDeleteView(CrudListViewMixin, BulkDeleteView):
+    pass
+
+
+class CrudEventStreamView(EventStreamView):
+    pass
+
+
 class CrudCreateView(CrudFormViewMixin, CreateView):
     pass
 
@@ -57,9 +115,17 @@ class CrudDeleteView(DeleteView):
     pass
 
 
-class CrudDetailView(DetailView):
+class CrudDetailViewMixin:
     viewset: "CrudViewSet"
 
+    @property
+    def conditional_get(self):
+        return self.viewset.conditional_get
+
+    @property
+    def version_field(self):
+        return self.viewset.version_field
+
     def get_detail_fields(self):
         detail_fields = self.viewset.get_detail_fields()
         if detail_fields:
@@ -72,6 +138,30 @@ class CrudDetailView(DetailView):
             return [field.name for field in model_opts._get_fields(reverse=False)]
 
 
+class CrudDetailView(CrudDetailViewMixin, DetailView):
+    pass
+
+
+class CrudAsyncListView(CrudListViewMixin, AsyncTableListView):
+    pass
+
+
+class CrudAsyncCreateView(CrudFormViewMixin, AsyncCreateView):
+    pass
+
+
+class CrudAsyncUpdateView(CrudFormViewMixin, AsyncUpdateView):
+    pass
+
+
+class CrudAsyncDeleteView(AsyncDeleteView):
+    pass
+
+
+class CrudAsyncDetailView(CrudDetailViewMixin, AsyncDetailView):
+    pass
+
+
 class CrudViewSet(ViewSet):
     list_display: list[str] = None
     fields: list[str] = None
@@ -80,6 +170,20 @@ class CrudViewSet(ViewSet):
     form_class = None
     filterset_class = None
     filterset_fields = None
+    facet_fields: list[str] = []
+    pagination_mode: str = "offset"
+    count_strategy: str = TableListView.count_strategy
+    search_fields: list[str] = []
+    search_backend = TableListView.search_backend
+    # answer list and detail with 304 Not Modified, validated by version_field
+    conditional_get: bool = False
+    version_field: str = None
+    # cache rendered list rows, by version_field
+    row_cache: bool = False
+    # use async list, detail and edit views, for ASGI servers
+    async_views: bool = False
+    # refresh list on changes of rows, streamed by the events action
+    live_updates: bool = TableListView.live_updates
 
     available_actions: dict[str, Action] = dict(
         list=Action(view_class=CrudListView),
@@ -87,6 +191,16 @@ class CrudViewSet(ViewSet):
         change=Action(view_class=CrudUpdateView),
         detail=Action(view_class=CrudDetailView),
         delete=Action(view_class=CrudDeleteView),
+        export=Action(view_class=CrudExportView, formats=CrudExportView.export_formats),
+        bulk_delete=Action(view_class=CrudBulkDeleteView),
+        events=Action(view_class=CrudEventStreamView),
+    )
+    async_available_actions: dict[str, Action] = dict(
+        list=Action(view_class=CrudAsyncListView),
+        add=Action(view_class=CrudAsyncCreateView),
+        change=Action(view_class=CrudAsyncUpdateView),
+        detail=Action(view_class=CrudAsyncDetailView),
+        delete=Action(view_class=CrudAsyncDeleteView),
     )
 
     def __init__(
@@ -104,8 +218,16 @@ class CrudViewSet(ViewSet):
             self.action(name, **kwargs)(view_class)
 
     def get_available_actions(self) -> dict[str, Action]:
+        if self.async_views:
+            return {**self.available_actions, **self.async_available_actions}
         return self.available_actions
 
+    def has_live_updates(self) -> bool:
+        return self.live_updates or super().has_live_updates()
+
+    def caches_query_values(self) -> bool:
+        return self.count_strategy == "cached" or super().caches_query_values()
+
     def get_list_display(self) -> list[str] | None:
         return self.list_display
 
@@ -4,3 +4,38 @@ from ..viewsets.base import ViewSet
 default_vs = ViewSet(name="default")
 
 ViewSetRegistry.default_viewset = default_vs
+
+
+def register_dashboard():
+    """Add dashboard, as default action, to default viewset if it has none"""
+    from ..views.dashboard import DashboardView
+
+    if not any(
+        action.default and not action.item for action in default_vs._actions.values()
+    ):
+        default_vs.action(
+            "dashboard",
+            default=True,
+            verbose_name="dashboard",
+            icon="ki-outline ki-home",
+        )(DashboardView)
+
+
+def register_widgets():
+    """
+    Add the endpoint rendering a widget, loaded by lazy widgets, and a JSON
+    data endpoint for each widget, to default viewset.
+    """
+    from ..dashboards import WIDGET_ACTION
+    from ..registries import dashboard_registry
+    from ..views.dashboard import DashboardWidgetDataView, DashboardWidgetView
+
+    if WIDGET_ACTION not in default_vs._actions:
+        default_vs.action(WIDGET_ACTION, hidden=True, url_path="widgets/<str:widget>/")(
+            DashboardWidgetView
+        )
+    for name in dashboard_registry:
+        if name not in default_vs._actions:
+            default_vs.action(
+                name, hidden=True, url_path=f"widgets/{name}/data/", widget=name
+            )(DashboardWidgetDataView)
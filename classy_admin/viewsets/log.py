@@ -1,39 +1,58 @@
-from django.apps import apps
-
+from ..audit import ADDITION, CHANGE, DELETION, build_entries, is_enabled, log_entries
 from .actions import Action
 
-action_mapping = {"add": 1, "change": 2, "delete": 3}
+action_mapping = {
+    "add": ADDITION,
+    "create": ADDITION,
+    "change": CHANGE,
+    "delete": DELETION,
+    "bulk_delete": DELETION,
+}
 
 
 class ActionLogMixin:
     action: Action
     enable_action_log = True
+    # LogEntry action flag, from action name when not set
+    action_log_flag: int = None
+
+    def get_action_log_flag(self) -> int:
+        if self.action_log_flag is not None:
+            return self.action_log_flag
+        return action_mapping.get(self.action.name, CHANGE)
+
+    def is_action_log_enabled(self) -> bool:
+        return self.enable_action_log and is_enabled(self.request.user)
+
+    def get_log_instances(self) -> list:
+        obj = getattr(self, "object", None)
+        if obj is not None:
+            return [obj]
+        # actions without object are logged on the request user
+        return [self.request.user]
+
+    def get_log_entries(self, instances) -> list:
+        return build_entries(
+            self.request.user,
+            instances,
+            self.get_action_log_flag(),
+            self.action.verbose_name,
+        )
+
+    def log_instances(self, instances, using=None):
+        """Log action on instances, written when the transaction commits"""
+        if self.is_action_log_enabled():
+            log_entries(self.get_log_entries(instances), using)
 
     def form_valid(self, *args, **kwargs):
-        response = super().form_valid(*args, **kwargs)
-        if self.enable_action_log:
-            self.log_action()
+        if not self.is_action_log_enabled():
+            return super().form_valid(*args, **kwargs)
+        if self.get_action_log_flag() == DELETION:
+            # built before the object is deleted and its pk cleared
+            entries = self.get_log_entries(self.get_log_instances())
+            response = super().form_valid(*args, **kwargs)
+        else:
+            response = super().form_valid(*args, **kwargs)
+            entries = self.get_log_entries(self.get_log_instances())
+        log_entries(entries)
         return response
-
-    def log_action(self):
-        target_obj = None
-        if hasattr(self, "object"):
-            target_obj = self.object
-        elif self.request.user.is_authenticated:
-            target_obj = self.request.user
-
-        if target_obj is None:
-            return  # disable log if has not object
-
-        user_id = None
-        if self.request.user.is_authenticated:
-            user_id = self.request.user.pk
-
-        LogEntry = apps.get_model("admin", "LogEntry")
-        LogEntry.objects.log_actions(
-            user_id=user_id,
-            queryset=[target_obj],
-            action_flag=action_mapping.get(self.action.name, 2),
-            change_message=self.action.verbose_name,
-            single_object=True,
-        )
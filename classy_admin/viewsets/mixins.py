@@ -4,7 +4,7 @@ from django.core.exceptions import ImproperlyConfigured
 from django.db.models.base import ModelBase
 from django.http import HttpRequest
 from django.urls import reverse
-from django_tables2.columns import Column, TemplateColumn
+from django_tables2.columns import CheckBoxColumn, Column, TemplateColumn
 
 from .actions import Action, ActionsManager
 from .breadcrumbs import BreadcrumbsMixin
@@ -14,14 +14,49 @@ if TYPE_CHECKING:
     from .base import ViewSet
 
 
+# query parameters not kept by bulk actions form
+BULK_IGNORED_PARAMS = ("page", "cursor", "per_page", "format", "_renderblock")
+
+
 class TableListMixin:
     table_extra_columns: list[tuple[str, Column]] = []
     actions_column = True
+    # checkbox column selecting rows for bulk actions, shown if any is allowed
+    selection_column = True
+
+    def get_selection_params(self) -> list[tuple[str, str]]:
+        """List query parameters, like filters, sent with the bulk actions"""
+        return [
+            (key, value)
+            for key, values in self.request.GET.lists()
+            if key not in BULK_IGNORED_PARAMS
+            for value in values
+        ]
 
     def get_table_kwargs(self):
         display_action_icons = getattr(self.viewset, "display_action_icons", None)
         display_action_labels = getattr(self.viewset, "display_action_labels", None)
         extra_columns = self.table_extra_columns.copy()
+        kwargs = {}
+        if self.selection_column and self.actions.bulk:
+            extra_columns.append(
+                (
+                    "selection",
+                    CheckBoxColumn(
+                        accessor="pk",
+                        exclude_from_export=True,
+                        attrs={
+                            "input": {"name": "pk", "form": "bulk-form"},
+                            "th__input": {
+                                "onclick": "document.querySelectorAll("
+                                "'input[name=pk][form=bulk-form]')"
+                                ".forEach(e => e.checked = this.checked)"
+                            },
+                        },
+                    ),
+                )
+            )
+            kwargs["sequence"] = ("selection", "...")
         if self.actions_column:
             extra_columns.append(
                 (
@@ -38,7 +73,7 @@ class TableListMixin:
                     ),
                 )
             )
-        return {"extra_columns": extra_columns}
+        return {**kwargs, "extra_columns": extra_columns}
 
 
 class SuccessUrlDefaultActionMixin:
@@ -0,0 +1,29 @@
+from django.contrib.auth.models import Group, User
+
+from classy_admin.dashboards import DashboardWidget
+from classy_admin.registries import dashboard_registry
+
+
+@dashboard_registry.register
+class UsersWidget(DashboardWidget):
+    order = 1
+    template_name = "sample_app/widgets/count.html"
+    cache_timeout = 60
+    permission_required = ["auth.view_user"]
+
+    def get_context_data(self, **kwargs):
+        return {"title": "Usuários", "count": User.objects.count()}
+
+    def get_json_data(self):
+        return {"active": User.objects.filter(is_active=True).count()}
+
+
+@dashboard_registry.register
+class GroupsWidget(DashboardWidget):
+    order = 2
+    template_name = "sample_app/widgets/count.html"
+    lazy = True
+    live_model = Group
+
+    def get_context_data(self, **kwargs):
+        return {"title": "Grupos", "count": Group.objects.count()}
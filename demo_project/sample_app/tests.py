@@ -1 +1,1452 @@
-# Create your tests here.
+import asyncio
+import csv
+import gc
+import html
+import importlib
+import io
+import json
+import os
+import queue
+import re
+import sys
+import tempfile
+import threading
+import weakref
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+from xml.etree import ElementTree
+
+from asgiref.sync import sync_to_async
+from django import urls
+from django.conf import settings
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import AnonymousUser, Group, Permission, User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.exceptions import PermissionDenied
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.template import Context, Template, engines
+from django.test import (
+    AsyncRequestFactory,
+    LiveServerTestCase,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.autoreload import file_changed
+from django.views.generic import View
+from render_block import render_block_to_string
+
+from classy_admin.audit import (
+    ADDITION,
+    BulkCreateAuditWriter,
+    QueuedAuditWriter,
+    build_entries,
+)
+from classy_admin.cache import KEY_PREFIX, connect_signals, get_cache
+from classy_admin.dashboards import DashboardWidget
+from classy_admin.events import FileEventBackend, get_channel, hub
+from classy_admin.preferences import (
+    DYNAMIC_PREFERENCE,
+    CachePreferencesStore,
+    DynamicPreferencesStore,
+    PreferencesStore,
+    SessionPreferencesStore,
+)
+from classy_admin.registries import dashboard_registry
+from classy_admin.search import SQLiteSearchBackend
+from classy_admin.views import AsyncDetailView, AsyncUpdateView, EventStreamView
+from classy_admin.views.bulk import bulk_update_form_factory
+from classy_admin.views.list import cached_filterset_factory
+from classy_admin.views.list_table import cached_table_factory
+from classy_admin.views.pagination import (
+    CachedCountPaginator,
+    EstimatedCountPaginator,
+    UncountedPaginator,
+)
+from classy_admin.views.query_plan import QueryPlan
+from classy_admin.views.responses import _template_blocks, render_blocks
+from classy_admin.views.row_cache import render_row_cells
+from classy_admin.viewsets import ViewSet
+from classy_admin.viewsets.actions import (
+    ActionsManager,
+    _object_url_template,
+    check_object,
+    reverse_object_url,
+)
+from demo_project import asgi
+from demo_project.sample_app.views.user import (
+    UserBulkDeleteView,
+    UserDetailView,
+    UserListView,
+    user_vs,
+)
+
+# urlconf of ObjectUrlTests
+urlpatterns = [
+    urls.path("int/<int:pk>/", View.as_view(), name="int-pk"),
+    urls.path("str/<str:pk>/change/", View.as_view(), name="str-pk"),
+    urls.path("path/<path:pk>/", View.as_view(), name="path-pk"),
+    urls.re_path(r"^args/(.+)/$", View.as_view(), name="args-pk"),
+    urls.path(
+        "other/",
+        urls.include(
+            ([urls.path("<pk>/", View.as_view(), name="auth-user-detail")], "viewsets"),
+            namespace="classy_admin",
+        ),
+    ),
+]
+
+# links of item actions and "add" action rendered on list pages
+ACTION_LINK_RE = re.compile(r'href="/auth/(\w+)/(?:\d+/|add/)')
+
+
+# list views save changed user preferences in session, keep sessions out of
+# database to avoid write locks between concurrent requests
+cookie_sessions = override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies"
+)
+
+
+class ConcurrentActionsMixin:
+    requests_count = 100
+    list_urls = {"/auth/user/": "user", "/auth/group/": "group"}
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        for i in range(10):
+            User.objects.create_user(f"user{i}")
+            Group.objects.create(name=f"group{i}")
+        self.client.force_login(self.user)
+        self.session_cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def get_paths(self):
+        return list(self.list_urls) * (self.requests_count // len(self.list_urls))
+
+    def assertActionLinks(self, path, content):
+        model_names = set(ACTION_LINK_RE.findall(content))
+        self.assertEqual(model_names, {self.list_urls[path]}, path)
+
+
+@cookie_sessions
+class ThreadedServerActionsTests(ConcurrentActionsMixin, LiveServerTestCase):
+    @classmethod
+    def _make_connections_override(cls):
+        # each server thread opens its own connection to the shared in-memory
+        # test database, instead of using one connection from many threads
+        return {}
+
+    def fetch(self, path):
+        request = Request(
+            self.live_server_url + path,
+            headers={"Cookie": f"{settings.SESSION_COOKIE_NAME}={self.session_cookie}"},
+        )
+        with urlopen(request) as response:
+            return path, response.read().decode()
+
+    def test_concurrent_list_requests(self):
+        # switch threads often to make interleaved requests likely
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(self.fetch, self.get_paths()))
+        finally:
+            sys.setswitchinterval(switch_interval)
+        for path, content in results:
+            self.assertActionLinks(path, content)
+
+
+@cookie_sessions
+class ASGIActionsTests(ConcurrentActionsMixin, TransactionTestCase):
+    async def fetch(self, path):
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.session_cookie}"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"cookie", cookie.encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        body = []
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                await asyncio.Event().wait()
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                self.assertEqual(message["status"], 200, path)
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        return path, b"".join(body).decode()
+
+    async def fetch_all(self):
+        return await asyncio.gather(*[self.fetch(path) for path in self.get_paths()])
+
+    def test_concurrent_list_requests(self):
+        # middlewares read settings on load, reload application with test settings
+        self.application = importlib.reload(asgi).application
+        for path, content in asyncio.run(self.fetch_all()):
+            self.assertActionLinks(path, content)
+
+
+class SingleObjectFetchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.target = User.objects.create_user("target")
+        self.client.force_login(self.user)
+
+    def count_object_fetches(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        table = User._meta.db_table
+        return len(
+            [
+                query
+                for query in queries.captured_queries
+                if f'FROM "{table}"' in query["sql"]
+                and f'"{table}"."id" = {self.target.pk}' in query["sql"]
+            ]
+        )
+
+    def test_item_actions_fetch_object_once(self):
+        for name, action in user_vs.action_table.filter(item=True).items():
+            with self.subTest(action=name):
+                url = action.get_object_url(self.target)
+                self.assertEqual(self.count_object_fetches(url), 1)
+
+    def test_permission_check_shares_object(self):
+        action = user_vs.bound_actions["detail"]
+        check = mock.Mock(return_value=True)
+        # finalized actions are read-only, their attributes are patched
+        with mock.patch.dict(action.__dict__, check=check):
+            url = action.get_object_url(self.target)
+            self.assertEqual(self.count_object_fetches(url), 1)
+        check.assert_any_call(action, mock.ANY, self.target)
+
+
+class BulkDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        for i in range(5):
+            User.objects.create_user(f"user{i}", is_active=i % 2 == 0)
+        self.client.force_login(self.user)
+
+    def test_delete_selected(self):
+        pks = User.objects.filter(username__in=["user0", "user1"]).values("pk")
+        query = "&".join(f"pk={row['pk']}" for row in pks)
+        response = self.client.post(f"/auth/user/bulk_delete/?{query}")
+        self.assertRedirects(response, "/auth/user/", fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(username__in=["user0", "user1"]))
+
+    def test_delete_all_filtered(self):
+        response = self.client.post(
+            "/auth/user/bulk_delete/?select_all=1&is_active=false"
+        )
+        self.assertRedirects(
+            response, "/auth/user/?is_active=false", fetch_redirect_response=False
+        )
+        self.assertFalse(User.objects.filter(is_active=False))
+        self.assertEqual(User.objects.count(), 4)
+
+    def test_invalid_filter_selects_nothing(self):
+        self.client.post("/auth/user/bulk_delete/?select_all=1&groups=invalid")
+        self.assertEqual(User.objects.count(), 6)
+
+    def test_selected_rows_filtered(self):
+        pks = User.objects.filter(username__in=["user0", "user1"]).values("pk")
+        query = "&".join(f"pk={row['pk']}" for row in pks)
+        self.client.post(f"/auth/user/bulk_delete/?{query}&is_active=false")
+        # user0 is active, out of the filtered list
+        self.assertTrue(User.objects.filter(username="user0").exists())
+        self.assertFalse(User.objects.filter(username="user1").exists())
+
+    def test_deletion_logged_in_chunks(self):
+        for i in range(5, 8):
+            User.objects.create_user(f"user{i}", is_active=False)
+        write = BulkCreateAuditWriter.write
+        with (
+            mock.patch.object(UserBulkDeleteView, "chunk_size", 2),
+            mock.patch.object(
+                BulkCreateAuditWriter, "write", autospec=True, side_effect=write
+            ) as mock_write,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.client.post("/auth/user/bulk_delete/?select_all=1&is_active=false")
+        sizes = [len(call.args[1]) for call in mock_write.call_args_list]
+        self.assertEqual(sizes, [2, 2, 1])
+        self.assertEqual(
+            set(LogEntry.objects.values_list("object_repr", flat=True)),
+            {"user1", "user3", "user5", "user6", "user7"},
+        )
+
+
+class BulkUpdateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        for i in range(6):
+            User.objects.create_user(f"user{i}")
+        self.client.force_login(self.user)
+
+    def update(self, usernames):
+        pks = User.objects.filter(username__in=usernames).values_list("pk", flat=True)
+        query = "&".join(f"pk={pk}" for pk in pks)
+        with (
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                f"/auth/user/bulk_change/?{query}",
+                {"is_active": "on", "is_staff": "on"},
+            )
+        self.assertRedirects(response, "/auth/user/", fetch_redirect_response=False)
+        return len(queries)
+
+    def test_update_selected(self):
+        self.update(["user0", "user1"])
+        self.assertEqual(
+            set(User.objects.filter(is_staff=True).values_list("username", flat=True)),
+            {"admin", "user0", "user1"},
+        )
+        self.assertFalse(User.objects.filter(is_active=False).exists())
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+    def test_queries_not_by_row(self):
+        self.update(["user5"])
+        self.assertEqual(
+            self.update(["user0", "user1"]), self.update(["user2", "user3", "user4"])
+        )
+
+
+class ActionLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def test_change_logged_once(self):
+        target = User.objects.create_user("target")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/auth/user/{target.pk}/change/", {"username": "changed"})
+        entries = LogEntry.objects.filter(object_id=str(target.pk))
+        self.assertEqual(entries.count(), 1)
+
+    def test_deletion_logged_with_object(self):
+        target = User.objects.create_user("target")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/auth/user/{target.pk}/delete/")
+        entry = LogEntry.objects.get(action_flag=DELETION)
+        self.assertEqual(entry.object_id, str(target.pk))
+        self.assertEqual(entry.object_repr, "target")
+
+
+class WidgetDataTests(TestCase):
+    url = "/widgets/demo_project.sample_app.dashboard_widgets.UsersWidget/data/"
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"active": 1})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+
+class EventsTests(TestCase):
+    async def test_change_published(self):
+        def create():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Group.objects.create(name="new")
+
+        with hub.subscribe(get_channel(Group)) as subscription:
+            group = await sync_to_async(create)()
+            event = await subscription.get(timeout=1)
+        self.assertEqual(event, {"model": "auth.group", "pk": group.pk})
+
+    def test_live_updates_opt_in(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(user)
+        self.assertNotContains(self.client.get("/auth/user/"), "data-events-url")
+        self.assertContains(
+            self.client.get("/auth/group/"), 'data-events-url="/auth/group/events/"'
+        )
+
+
+class EventStreamTests(TestCase):
+    url = "/auth/group/events/"
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+
+    def test_no_content_outside_asgi(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+
+    async def test_stream_frames(self):
+        request = AsyncRequestFactory().get(self.url)
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        with mock.patch.object(EventStreamView, "heartbeat", 0.01):
+            response = await resolve(self.url).func(request)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            frames = aiter(response.streaming_content)
+            self.assertEqual(await anext(frames), b"retry: 5000\n\n")
+            # subscribed once the first frame is sent
+            hub.dispatch(get_channel(Group), {"model": "auth.group", "pk": 1})
+            self.assertEqual(
+                await anext(frames),
+                b'event: change\ndata: {"model": "auth.group", "pk": 1}\n\n',
+            )
+            self.assertEqual(await anext(frames), b": ping\n\n")
+            await frames.aclose()
+
+
+class RecordingHub:
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def dispatch(self, channel, data):
+        self.events.put((channel, data))
+
+
+class FileEventBackendTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.hub = RecordingHub()
+        self.backend = FileEventBackend(self.hub)
+        self.backend.path = os.path.join(directory.name, "events.jsonl")
+        self.backend.poll_interval = 0.01
+        self.backend.publish("old", 0)
+        self.backend.start()
+        self.addCleanup(self.backend.stop)
+        # the file is tailed from its end once the thread has started
+        while True:
+            self.backend.publish("ready", None)
+            try:
+                self.hub.events.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+
+    def next_event(self):
+        while True:
+            channel, data = self.hub.events.get(timeout=5)
+            if channel != "ready":
+                return channel, data
+
+    def test_events_dispatched(self):
+        self.backend.publish("auth.group", {"pk": 1})
+        with open(self.backend.path, "a") as file:
+            file.write("invalid\n")
+        self.backend.publish("auth.user", {"pk": 2})
+        self.assertEqual(self.next_event(), ("auth.group", {"pk": 1}))
+        self.assertEqual(self.next_event(), ("auth.user", {"pk": 2}))
+
+    def test_truncated_file_read_from_start(self):
+        self.backend.max_size = 100
+        for pk in range(10):
+            self.backend.publish("auth.group", {"pk": pk})
+            self.assertEqual(self.next_event(), ("auth.group", {"pk": pk}))
+        self.assertLess(os.path.getsize(self.backend.path), 200)
+
+
+class SidebarMenuTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def test_active_item_marked_on_cached_menu(self):
+        self.client.get("/auth/user/")
+        content = self.client.get("/auth/group/").content.decode()
+        self.assertRegex(content, r'href="/auth/group/"\s+class="nav-link active"')
+        self.assertNotRegex(content, r'href="/auth/user/"\s+class="nav-link active"')
+
+
+class RowCacheTests(TestCase):
+    url = "/auth/user/?per_page=25"
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        for i in range(24):
+            User.objects.create_user(f"user{i}")
+        self.client.force_login(self.user)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_row_cache_adds_no_queries(self):
+        self.count_queries()
+        uncached = self.count_queries()
+        view = UserListView
+        with (
+            mock.patch.object(view, "row_cache", True),
+            mock.patch.object(view, "version_field", "date_joined", create=True),
+        ):
+            # rows rendered, then read from cache
+            self.assertEqual(self.count_queries(), uncached)
+            self.assertEqual(self.count_queries(), uncached)
+
+    def get_rows(self):
+        content = self.client.get(self.url).content.decode()
+        rows = content[content.index("<tbody>") : content.index("</tbody>")]
+        return re.sub(r"\s+", " ", rows)
+
+    def test_cells_inline_without_row_cache(self):
+        get_cache().clear()
+        with mock.patch(
+            "classy_admin.views.row_cache.render_row_cells",
+            wraps=render_row_cells,
+        ) as render:
+            rows = self.get_rows()
+            render.assert_not_called()
+            with (
+                mock.patch.object(UserListView, "row_cache", True),
+                mock.patch.object(
+                    UserListView, "version_field", "date_joined", create=True
+                ),
+            ):
+                self.assertEqual(self.get_rows(), rows)
+            self.assertEqual(render.call_count, 25)
+
+
+class DashboardTests(TestCase):
+    widgets_url = "/widgets/demo_project.sample_app.dashboard_widgets"
+
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def test_cached_widget(self):
+        self.assertContains(self.client.get("/"), '"card-text fs-3">1<')
+        User.objects.create_user("other")
+        self.assertContains(self.client.get("/"), '"card-text fs-3">1<')
+
+    def test_lazy_widget(self):
+        url = f"{self.widgets_url}.GroupsWidget/"
+        response = self.client.get("/")
+        self.assertContains(response, f'hx-get="{url}"')
+        self.assertNotContains(response, "Grupos")
+        self.assertContains(self.client.get(url), "Grupos")
+
+    def test_widget_permissions(self):
+        user = User.objects.create_user("staff", is_staff=True)
+        self.client.force_login(user)
+        self.assertNotContains(self.client.get("/"), "Usuários")
+        users_url = f"{self.widgets_url}.UsersWidget/"
+        self.assertEqual(self.client.get(users_url).status_code, 403)
+        self.assertEqual(self.client.get(f"{users_url}data/").status_code, 403)
+        # live_model view permission by default
+        groups_url = f"{self.widgets_url}.GroupsWidget/"
+        self.assertEqual(self.client.get(groups_url).status_code, 403)
+        user.user_permissions.add(Permission.objects.get(codename="view_group"))
+        self.assertEqual(self.client.get(groups_url).status_code, 200)
+
+    def test_concurrent_rendering(self):
+        # each widget waits for the other, rendering them in turn times out
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierWidget(DashboardWidget):
+            template_name = "sample_app/widgets/count.html"
+
+            def get_context_data(self, **kwargs):
+                barrier.wait()
+                return {"title": "barrier", "count": threading.current_thread().name}
+
+        widgets = {"first": BarrierWidget, "second": BarrierWidget}
+        with mock.patch.dict(dashboard_registry, widgets, clear=True):
+            response = self.client.get("/")
+        self.assertContains(response, "classy-admin-widget", count=2)
+
+
+class PageSizeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def get_per_page(self, query=""):
+        response = self.client.get(f"/auth/user/{query}")
+        return response.context["table"].paginator.per_page
+
+    def test_offered_size_saved(self):
+        self.assertEqual(self.get_per_page("?per_page=25"), 25)
+        self.assertEqual(self.get_per_page(), 25)
+
+    def test_other_sizes_ignored(self):
+        for per_page in ("0", "1000000", "7"):
+            with self.subTest(per_page=per_page):
+                self.assertEqual(self.get_per_page(f"?per_page={per_page}"), 10)
+                self.assertEqual(self.get_per_page(), 10)
+
+
+class PreferencesStoreTests(TestCase):
+    stores = {
+        "session": SessionPreferencesStore,
+        "cache": CachePreferencesStore,
+        "dynamic_preferences": DynamicPreferencesStore,
+    }
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+        get_cache().clear()
+
+    def get_per_page(self, query=""):
+        response = self.client.get(f"/auth/user/{query}")
+        return response, response.context["table"].paginator.per_page
+
+    def test_unchanged_preferences_not_written(self):
+        for name, store in self.stores.items():
+            with (
+                self.subTest(store=name),
+                mock.patch.object(UserListView, "preferences_store", name),
+            ):
+                self.assertEqual(self.get_per_page("?per_page=25")[1], 25)
+                with mock.patch.object(store, "write") as write:
+                    for query in ("", "?per_page=25"):
+                        response, per_page = self.get_per_page(query)
+                        self.assertEqual(per_page, 25)
+                        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+                write.assert_not_called()
+                self.get_per_page("?per_page=10")
+
+    def test_dynamic_preferences_saved_by_user(self):
+        with mock.patch.object(
+            UserListView, "preferences_store", "dynamic_preferences"
+        ):
+            self.get_per_page("?per_page=25")
+            self.client.logout()
+            self.client.force_login(self.user)
+            self.assertEqual(self.get_per_page()[1], 25)
+        user = User.objects.get(pk=self.user.pk)
+        preferences = json.loads(user.preferences[DYNAMIC_PREFERENCE])
+        key = user_vs.bound_actions["list"].url_name
+        self.assertEqual(preferences, {key: {"per_page": 25}})
+
+    def test_abstract_store(self):
+        with self.assertRaises(TypeError):
+            PreferencesStore(None, "key")
+
+
+# FTS tables created in a transaction can't be rolled back by TestCase
+class SQLiteSearchTests(TransactionTestCase):
+    fields = ["username", "email"]
+
+    def setUp(self):
+        self.backend = SQLiteSearchBackend(User, self.fields)
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+
+    def tearDown(self):
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for suffix in ("ai", "ad", "au"):
+                name = quote(self.backend.trigger_name(suffix))
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(self.backend.index_name)}")
+
+    def search(self, term):
+        return list(self.backend.search(User.objects.all(), term))
+
+    def test_icontains_until_built(self):
+        self.assertFalse(self.backend.is_ready("default"))
+        self.assertEqual(self.search("lic"), [self.alice])
+        self.assertTrue(self.backend.build_index("default"))
+        self.assertFalse(self.backend.build_index("default"))
+        # terms match prefixes of words
+        self.assertEqual(self.search("lic"), [])
+        self.assertEqual(self.search("ali"), [self.alice])
+        self.assertEqual(self.search('"example.com"'), [self.alice])
+
+    def test_index_built_elsewhere(self):
+        self.assertFalse(self.backend.is_ready("default"))
+        SQLiteSearchBackend(User, self.fields).build_index("default")
+        self.assertTrue(self.backend.is_ready("default"))
+
+    def test_triggers_update_index(self):
+        self.backend.build_index("default")
+        bob = User.objects.create_user("bob")
+        self.assertEqual(self.search("bob"), [bob])
+        User.objects.filter(pk=bob.pk).update(username="robert")
+        self.assertEqual(self.search("bob"), [])
+        self.assertEqual(self.search("rob"), [bob])
+        bob.delete()
+        self.assertEqual(self.search("rob"), [])
+        self.assertTrue(self.backend.build_index("default", rebuild=True))
+        self.assertEqual(self.search("ali"), [self.alice])
+
+
+class CheckManyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.users = [User.objects.create_user(f"user{i}") for i in range(4)]
+        self.allowed = {self.users[0].pk, self.users[2].pk}
+        self.check_many = mock.Mock(
+            side_effect=lambda action, request, objects: [
+                obj.pk for obj in objects if obj.pk in self.allowed
+            ]
+        )
+        self.action = user_vs.bound_actions["delete"]
+        patcher = mock.patch.dict(self.action.__dict__, check_many=self.check_many)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_checked_once_per_page(self):
+        self.client.force_login(self.user)
+        content = self.client.get("/auth/user/").content.decode()
+        self.check_many.assert_called_once()
+        self.assertEqual(len(self.check_many.call_args.args[2]), 5)
+        deleted = {int(pk) for pk in re.findall(r"/auth/user/(\d+)/delete/", content)}
+        self.assertEqual(deleted, self.allowed)
+
+    def test_action_check_reads_results(self):
+        request = RequestFactory().get("/auth/user/")
+        request.user = self.user
+        view = mock.Mock(viewset=user_vs, request=request)
+        view.action.name = "list"
+        ActionsManager(view).check_objects(self.users)
+        template = Template(
+            "{% load actions_tags %}"
+            "{% for obj in users %}"
+            "{% action_check action obj as allowed %}{% if allowed %}{{ obj.pk }} "
+            "{% endif %}{% endfor %}"
+        )
+        context = Context(
+            {"request": request, "action": self.action, "users": self.users}
+        )
+        allowed = {int(pk) for pk in template.render(context).split()}
+        self.assertEqual(allowed, self.allowed)
+        self.check_many.assert_called_once()
+
+
+class RequestCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.request = RequestFactory().get("/auth/user/")
+        self.request.user = self.user
+        self.detail = user_vs.bound_actions["detail"]
+        self.delete = user_vs.bound_actions["delete"]
+        self.check = mock.Mock(return_value=True)
+        self.check_many = mock.Mock(
+            side_effect=lambda action, request, objects: [obj.pk for obj in objects]
+        )
+        patchers = [
+            mock.patch.dict(self.detail.__dict__, check=self.check),
+            mock.patch.dict(self.delete.__dict__, check_many=self.check_many),
+            mock.patch.object(
+                User, "has_perm", autospec=True, side_effect=User.has_perm
+            ),
+        ]
+        self.has_perm = patchers[-1].start()
+        for patcher in patchers[:-1]:
+            patcher.start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def get_manager(self):
+        view = mock.Mock(viewset=user_vs, request=self.request)
+        view.action.name = "list"
+        return ActionsManager(view)
+
+    def test_allowed_memoized_per_request(self):
+        allowed = self.get_manager().allowed
+        self.get_manager().item
+        calls = self.has_perm.call_count, self.check.call_count
+        self.assertTrue(all(calls))
+        # other views of the request share the results
+        for _ in range(3):
+            self.assertEqual(self.get_manager().allowed, allowed)
+            self.get_manager().item
+        self.assertEqual((self.has_perm.call_count, self.check.call_count), calls)
+
+    def test_object_checks_memoized_per_request(self):
+        manager = self.get_manager()
+        manager.check_objects([self.user])
+        self.check_many.assert_called_once()
+        for _ in range(3):
+            self.assertTrue(check_object(self.delete, self.request, self.user))
+            self.get_manager().for_object(self.user)
+        self.check_many.assert_called_once()
+
+    def test_cache_reset_on_user_change(self):
+        manager = self.get_manager()
+        manager.check_objects([self.user])
+        self.assertTrue(check_object(self.delete, self.request, self.user))
+        self.check_many.assert_called_once()
+        calls = self.has_perm.call_count
+        manager.allowed
+        self.assertGreater(self.has_perm.call_count, calls)
+        self.request.user = other = User.objects.create_superuser("other", "", "x")
+        calls = self.has_perm.call_count
+        manager.allowed
+        self.assertGreater(self.has_perm.call_count, calls)
+        self.has_perm.assert_called_with(other, mock.ANY)
+        # object checks of the previous user are dropped
+        self.assertTrue(check_object(self.delete, self.request, self.user))
+        self.has_perm.assert_called_with(other, "auth.delete_user", self.user)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ObjectUrlTests(SimpleTestCase):
+    def assertReversed(self, url_name, pk):
+        self.assertEqual(reverse_object_url(url_name, pk), reverse(url_name, args=[pk]))
+
+    def test_int_pk(self):
+        for pk in (1, 12345, "7"):
+            self.assertReversed("int-pk", pk)
+        self.assertEqual(reverse_object_url("int-pk", 1), "/int/1/")
+
+    def test_quoted_pk(self):
+        for pk in ("abc", "a b", "ação", "x?y#z", "50%", "a:b@c", "~!$&'()*+,;="):
+            self.assertReversed("str-pk", pk)
+        self.assertEqual(reverse_object_url("str-pk", "a b"), "/str/a%20b/change/")
+        self.assertIsNotNone(_object_url_template("str-pk", None, "/"))
+
+    def test_fallback_to_reverse(self):
+        # slashes are only matched by some converters
+        self.assertReversed("path-pk", "a/b")
+        self.assertEqual(reverse_object_url("path-pk", "a/b"), "/path/a/b/")
+        # placeholder not matched by the int converter
+        self.assertIsNone(_object_url_template("int-pk", None, "/"))
+        # no pk keyword argument
+        self.assertIsNone(_object_url_template("args-pk", None, "/"))
+        self.assertReversed("args-pk", "a b")
+
+    def test_action_url(self):
+        action = user_vs.bound_actions["detail"]
+        user = User(pk=3)
+        template = Template("{% load actions_tags %}{% action_url action obj %}")
+        url = template.render(Context({"action": action, "obj": user}))
+        self.assertEqual(url, reverse(action.url_name, args=[3]))
+
+    def test_cleared_on_urlconf_change(self):
+        url_name = user_vs.bound_actions["detail"].url_name
+        self.assertEqual(reverse_object_url(url_name, 1), "/other/1/")
+        with override_settings(ROOT_URLCONF="demo_project.urls"):
+            self.assertReversed(url_name, 1)
+            self.assertTrue(reverse_object_url(url_name, 1).startswith("/auth/user/"))
+        self.assertEqual(reverse_object_url(url_name, 1), "/other/1/")
+
+
+class ClassCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def get_classes(self):
+        context = self.client.get("/auth/user/?is_active=true").context
+        return type(context["table"]), type(context["filter"])
+
+    def test_classes_reused_by_requests(self):
+        table_class, filterset_class = self.get_classes()
+        self.assertEqual(self.get_classes(), (table_class, filterset_class))
+        self.assertIs(
+            cached_filterset_factory(User, UserListView.filterset_fields),
+            filterset_class,
+        )
+        self.assertIs(
+            cached_filterset_factory(User, {"username": ["exact", "icontains"]}),
+            cached_filterset_factory(User, {"username": ["exact", "icontains"]}),
+        )
+
+    def test_cleared_on_file_changed(self):
+        table_class = cached_table_factory(User, ("username",))
+        form_class = bulk_update_form_factory(User, ("is_active",))
+        self.assertIs(cached_table_factory(User, ("username",)), table_class)
+        self.assertIs(bulk_update_form_factory(User, ("is_active",)), form_class)
+        file_changed.send(sender=None, file_path=Path(__file__))
+        self.assertIsNot(cached_table_factory(User, ("username",)), table_class)
+        self.assertIsNot(bulk_update_form_factory(User, ("is_active",)), form_class)
+
+
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        group = Group.objects.create(name="staff")
+        for i in range(3):
+            User.objects.create_user(f"user{i}").groups.add(group)
+
+    def test_many_to_many_prefetched(self):
+        plan = QueryPlan.from_paths(User, ["username", "groups__name"])
+        self.assertEqual(plan.select_related, [])
+        self.assertEqual(plan.prefetch_related, ["groups"])
+        self.assertEqual(plan.only, ["id", "username"])
+        with self.assertNumQueries(2):
+            rows = [
+                (user.username, [group.name for group in user.groups.all()])
+                for user in plan.apply(User.objects.all())
+            ]
+        self.assertEqual(len(rows), 3)
+
+    def test_foreign_key_joined(self):
+        plan = QueryPlan.from_paths(
+            Permission, ["name", "content_type__app_label"], ordering=["codename"]
+        )
+        self.assertEqual(plan.select_related, ["content_type"])
+        self.assertEqual(plan.prefetch_related, [])
+        self.assertEqual(
+            plan.only, ["codename", "content_type__app_label", "id", "name"]
+        )
+        with self.assertNumQueries(1):
+            rows = [
+                (permission.name, permission.content_type.app_label)
+                for permission in plan.apply(Permission.objects.order_by("codename"))
+            ]
+        self.assertTrue(rows)
+
+
+@mock.patch.object(UserListView, "pagination_mode", "keyset")
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        # few distinct names, pages split rows of equal names
+        for i in range(24):
+            User.objects.create_user(f"user{i}", first_name=f"name{i % 3}")
+        self.client.force_login(self.user)
+
+    def get_page(self, sort, cursor=None):
+        query = {"sort": sort}
+        if cursor:
+            query["cursor"] = cursor
+        response = self.client.get("/auth/user/", query)
+        page = response.context["table"].page
+        # prev/next links
+        links = {
+            parse_qs(urlsplit(html.unescape(href)).query)["cursor"][0]
+            for href in re.findall(
+                r'<a href="(\?[^"]*)"[^>]*class="page-link"', response.content.decode()
+            )
+        }
+        return page, [row.record.pk for row in page], links
+
+    def walk(self, sort):
+        """Pks of all pages, following next then previous cursors"""
+        page, pks, links = self.get_page(sort)
+        self.assertFalse(page.has_previous())
+        self.assertEqual(links, {page.next_cursor})
+        pages = [pks]
+        while page.has_next():
+            page, pks, links = self.get_page(sort, page.next_cursor)
+            self.assertEqual(links, {page.previous_cursor, page.next_cursor} - {None})
+            pages.append(pks)
+        previous_pages = [pks]
+        while page.has_previous():
+            page, pks, _ = self.get_page(sort, page.previous_cursor)
+            previous_pages.insert(0, pks)
+        self.assertEqual(previous_pages, pages)
+        return [pk for pks in pages for pk in pks]
+
+    def test_ascending(self):
+        expected = list(
+            User.objects.order_by("first_name", "pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk("first_name"), expected)
+
+    def test_descending_with_ties(self):
+        expected = list(
+            User.objects.order_by("-first_name", "pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk("-first_name"), expected)
+
+    def test_invalid_cursor(self):
+        first_page, first_pks, _ = self.get_page("first_name")
+        cursor = first_page.next_cursor
+        for invalid in (cursor[:-2] + "xx", "garbage"):
+            with self.subTest(cursor=invalid):
+                page, pks, _ = self.get_page("first_name", invalid)
+                self.assertFalse(page.has_previous())
+                self.assertEqual(pks, first_pks)
+        # cursor of another ordering
+        page, pks, _ = self.get_page("-first_name", cursor)
+        self.assertFalse(page.has_previous())
+        self.assertEqual(pks, self.get_page("-first_name")[1])
+
+
+class CountPaginationTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        for i in range(24):
+            User.objects.create_user(f"user{i}")
+        self.client.force_login(self.user)
+
+    def get_table(self, count_strategy, page):
+        with mock.patch.object(UserListView, "count_strategy", count_strategy):
+            response = self.client.get("/auth/user/", {"page": page})
+        return response.context["table"]
+
+    def test_cached_count(self):
+        connect_signals([User])
+        uid = f"{KEY_PREFIX}:table-version:auth.user"
+        self.addCleanup(post_save.disconnect, sender=User, dispatch_uid=uid)
+        self.addCleanup(post_delete.disconnect, sender=User, dispatch_uid=uid)
+        queryset = User.objects.order_by("pk")
+        self.assertEqual(CachedCountPaginator(queryset, 10).count, 25)
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(queryset, 10).count, 25)
+        # saving a row expires the count
+        User.objects.create_user("other")
+        self.assertEqual(CachedCountPaginator(queryset, 10).count, 26)
+
+    def test_uncounted(self):
+        paginator = UncountedPaginator(User.objects.order_by("pk"), 10)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(paginator.page(1).has_next())
+            page = paginator.page(3)
+        self.assertNotIn("COUNT", " ".join(q["sql"] for q in queries))
+        self.assertFalse(page.has_next())
+        self.assertEqual((page.start_index(), page.end_index()), (21, 25))
+
+    def test_estimated_count(self):
+        queryset = User.objects.order_by("pk")
+        # estimates of small tables are not used
+        with mock.patch(
+            "classy_admin.views.pagination.estimate_count", return_value=20
+        ):
+            paginator = EstimatedCountPaginator(queryset, 10)
+            self.assertFalse(paginator.count_is_estimate)
+            self.assertEqual(paginator.count, 25)
+        with mock.patch(
+            "classy_admin.views.pagination.estimate_count", return_value=50000
+        ):
+            paginator = EstimatedCountPaginator(queryset, 10)
+            self.assertTrue(paginator.count_is_estimate)
+            self.assertEqual(paginator.num_pages, 5000)
+            # last page reached, count is known
+            paginator.page(3)
+            self.assertFalse(paginator.count_is_estimate)
+            self.assertEqual(paginator.count, 25)
+
+    def test_out_of_range_page(self):
+        # counted rows go to the last page, uncounted ones to the first
+        for count_strategy, number in [
+            ("exact", 3),
+            ("cached", 3),
+            ("estimate", 1),
+            ("none", 1),
+        ]:
+            with self.subTest(count_strategy=count_strategy):
+                table = self.get_table(count_strategy, 99)
+                self.assertEqual(table.page.number, number)
+                self.assertTrue(table.page.object_list)
+
+
+class ExportTests(TestCase):
+    url = "/auth/user/export/"
+    header = [
+        "Username",
+        "First name",
+        "Last name",
+        "Last login",
+        "Active",
+        "Staff status",
+        "Superuser status",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        User.objects.create_user("bob", first_name='Bob, "B"')
+        User.objects.create_user("carl", is_active=False)
+        self.client.force_login(self.user)
+
+    def export(self, export_format, **query):
+        response = self.client.get(self.url, {"format": export_format, **query})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="users.{export_format}"',
+        )
+        return b"".join(response.streaming_content)
+
+    def test_csv(self):
+        content = self.export("csv", sort="username").decode()
+        self.assertTrue(content.startswith("\ufeff"))
+        rows = list(csv.reader(io.StringIO(content[1:])))
+        self.assertEqual(rows[0], self.header)
+        self.assertEqual(
+            [row[:2] for row in rows[1:]],
+            [["admin", ""], ["bob", 'Bob, "B"'], ["carl", ""]],
+        )
+        # rows filtered as in the list
+        content = self.export("csv", is_active="false").decode()
+        rows = list(csv.reader(io.StringIO(content[1:])))
+        self.assertEqual([row[0] for row in rows[1:]], ["carl"])
+
+    def test_jsonl(self):
+        lines = self.export("jsonl", sort="username").decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(list(rows[0]), self.header)
+        self.assertEqual([row["Username"] for row in rows], ["admin", "bob", "carl"])
+        self.assertEqual(rows[1]["First name"], 'Bob, "B"')
+
+    def test_xlsx(self):
+        archive = zipfile.ZipFile(io.BytesIO(self.export("xlsx", sort="username")))
+        self.assertIsNone(archive.testzip())
+        self.assertIn("xl/workbook.xml", archive.namelist())
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+        ns = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        rows = [
+            [cell.findtext("x:is/x:t", "", ns) for cell in row.findall("x:c", ns)]
+            for row in sheet.findall("x:sheetData/x:row", ns)
+        ]
+        self.assertEqual(rows[0], self.header)
+        self.assertEqual([row[0] for row in rows[1:]], ["admin", "bob", "carl"])
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {"format": "pdf"})
+        self.assertEqual(response.status_code, 404)
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.group = Group.objects.create(name="staff")
+        for i in range(3):
+            User.objects.create_user(f"user{i}").groups.add(self.group)
+        User.objects.create_user("inactive", is_active=False).groups.add(self.group)
+        self.client.force_login(self.user)
+
+    def test_counts_of_filtered_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/auth/user/", {"is_active": "true"})
+        self.assertEqual(
+            response.context["view"].facets,
+            {
+                "is_active": {True: 4},
+                "is_staff": {True: 1, False: 3},
+                "groups": {self.group.pk: 3, None: 1},
+            },
+        )
+        # one query per facet field
+        facet_queries = [q for q in queries if "facet_count" in q["sql"]]
+        self.assertEqual(len(facet_queries), 3)
+        self.assertContains(response, "staff (3)")
+
+
+@mock.patch.object(UserListView, "conditional_get", True)
+@mock.patch.object(UserListView, "version_field", "last_login", create=True)
+@mock.patch.object(UserDetailView, "conditional_get", True)
+@mock.patch.object(UserDetailView, "version_field", "last_login")
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        User.objects.create_user("other")
+        self.client.force_login(self.user)
+
+    def revalidate(self, url, response, **query):
+        return self.client.get(
+            url, query, headers={"if-none-match": response["ETag"]}
+        ).status_code
+
+    def test_list(self):
+        url = "/auth/user/"
+        response = self.client.get(url)
+        self.assertIn("ETag", response)
+        self.assertEqual(self.revalidate(url, response), 304)
+        self.assertEqual(self.revalidate(url, response, per_page=25), 200)
+        # ordering saved in preferences changes the page
+        self.client.get(url, {"sort": "-username"})
+        self.assertEqual(self.revalidate(url, response), 200)
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response), 304)
+        # a row saved with a new version
+        User.objects.filter(username="other").update(last_login=timezone.now())
+        self.assertEqual(self.revalidate(url, response), 200)
+        response = self.client.get(url)
+        User.objects.create_user("new")
+        self.assertEqual(self.revalidate(url, response), 200)
+
+    def test_detail(self):
+        url = user_vs.bound_actions["detail"].get_object_url(self.user)
+        response = self.client.get(url)
+        since = {"if-modified-since": response["Last-Modified"]}
+        self.assertEqual(self.revalidate(url, response), 304)
+        self.assertEqual(self.client.get(url, headers=since).status_code, 304)
+        self.user.last_login += timedelta(seconds=1)
+        self.user.save()
+        self.assertEqual(self.revalidate(url, response), 200)
+        self.assertEqual(self.client.get(url, headers=since).status_code, 200)
+
+
+BLOCK_TEMPLATES = {
+    "base.html": (
+        "<title>{% block title %}Base{% endblock %}</title>"
+        "{% block content %}<p>{% block inner %}inner{% endblock %}</p>"
+        "{% endblock %}"
+    ),
+    "child.html": (
+        '{% extends "base.html" %}'
+        "{% block title %}{{ name }} - {{ block.super }}{% endblock %}"
+        "{% block inner %}{{ block.super }} of {{ name }}{% endblock %}"
+    ),
+}
+
+
+@override_settings(
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.cached.Loader",
+                        [("django.template.loaders.locmem.Loader", BLOCK_TEMPLATES)],
+                    )
+                ],
+            },
+        }
+    ]
+)
+class RenderBlocksTests(SimpleTestCase):
+    names = ["title", "content", "inner"]
+
+    def setUp(self):
+        self.templates = dict(BLOCK_TEMPLATES)
+        self.addCleanup(BLOCK_TEMPLATES.update, self.templates)
+
+    def test_matches_render_block(self):
+        context = {"name": "child"}
+        template = engines["django"].get_template("child.html")
+        self.assertEqual(
+            render_blocks(template, self.names, context),
+            {
+                name: render_block_to_string("child.html", name, context)
+                for name in self.names
+            },
+        )
+        # blocks from cache
+        self.assertIn(template.template, _template_blocks)
+        self.assertEqual(
+            render_blocks(template, ["title"], {"name": "other"}),
+            {"title": "other - Base"},
+        )
+
+    def test_template_reload(self):
+        engine = engines["django"]
+        template = engine.get_template("child.html")
+        render_blocks(template, ["title"], {"name": "child"})
+        old = weakref.ref(template.template)
+        BLOCK_TEMPLATES["base.html"] = "{% block title %}New{% endblock %}"
+        engine.engine.template_loaders[0].reset()
+        del template
+        gc.collect()
+        # stale blocks are dropped with their template
+        self.assertIsNone(old())
+        template = engine.get_template("child.html")
+        self.assertEqual(
+            render_blocks(template, ["title"], {"name": "child"}),
+            {"title": "child - New"},
+        )
+
+
+@override_settings(
+    MESSAGE_STORAGE="django.contrib.messages.storage.cookie.CookieStorage"
+)
+@mock.patch("classy_admin.views.mixins.TemplateMixin.boosted_navigation", True)
+class BoostedNavigationTests(TestCase):
+    headers = {"HX-Request": "true", "HX-Boosted": "true"}
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.client.force_login(self.user)
+
+    def test_main_block_and_out_of_band_blocks(self):
+        response = self.client.get("/auth/group/", headers=self.headers)
+        content = response.content.decode()
+        self.assertNotIn("<html", content)
+        self.assertNotIn('id="app-main"', content)
+        self.assertIn('id="listing-content"', content)
+        self.assertRegex(content, r"<title>\S[^<]*\S</title>")
+        self.assertIn('<div id="app-afterlayout" hx-swap-oob="true">', content)
+        self.assertIn("HX-Boosted", response["Vary"])
+        # full page without boost header
+        response = self.client.get("/auth/group/")
+        self.assertContains(response, 'hx-boost="true"')
+        self.assertContains(response, 'id="app-main"')
+
+    def test_messages(self):
+        self.client.post("/auth/group/add/", {"name": "editors"})
+        response = self.client.get("/auth/group/", headers=self.headers)
+        self.assertContains(response, "Group &quot;editors&quot; foi adicionado")
+
+    def test_page_out_of_layout(self):
+        self.client.logout()
+        response = self.client.get("/accounts/login/", headers=self.headers)
+        self.assertEqual(response["HX-Redirect"], "/accounts/login/")
+        self.assertEqual(response.content, b"")
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        self.target = User.objects.create_user("target")
+        self.staff = User.objects.create_user("staff", is_staff=True)
+
+    def get_view(self, name, async_class):
+        """View of viewset action, made async"""
+        action = user_vs.bound_actions[name]
+        view_class = type("AsyncView", (async_class, action.view_class), {})
+        return view_class.as_view(**user_vs.get_view_kwargs(action))
+
+    async def call(self, view, user, method="get", data=None):
+        request = getattr(AsyncRequestFactory(), method)(
+            f"/auth/user/{self.target.pk}/", data
+        )
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        response = await view(request, pk=str(self.target.pk))
+        if hasattr(response, "render"):
+            await sync_to_async(response.render)()
+        return response
+
+    async def test_anonymous_redirected(self):
+        view = self.get_view("detail", AsyncDetailView)
+        response = await self.call(view, AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith("/accounts/login/"))
+
+    async def test_permission_denied(self):
+        view = self.get_view("detail", AsyncDetailView)
+        with self.assertRaises(PermissionDenied):
+            await self.call(view, self.staff)
+
+    async def test_permission_check_of_action(self):
+        action = user_vs.bound_actions["detail"]
+        check = mock.Mock(return_value=True)
+        view = self.get_view("detail", AsyncDetailView)
+        with mock.patch.dict(action.__dict__, check=check):
+            response = await self.call(view, self.staff)
+        self.assertEqual(response.status_code, 200)
+        check.assert_called_once_with(action, mock.ANY, self.target)
+
+    async def test_detail(self):
+        view = self.get_view("detail", AsyncDetailView)
+        response = await self.call(view, self.user)
+        self.assertContains(response, "target")
+
+    async def test_edit_post(self):
+        view = self.get_view("change", AsyncUpdateView)
+        data = {"username": "renamed", "is_active": "on"}
+        response = await self.call(view, self.user, "post", data)
+        self.assertEqual(response.status_code, 302)
+        await self.target.arefresh_from_db()
+        self.assertEqual(self.target.username, "renamed")
+
+
+class ActionTableTests(SimpleTestCase):
+    def setUp(self):
+        viewset = ViewSet(name="things", register=False)
+        actions = {
+            "list": {},
+            "add": {},
+            "detail": {},
+            "change": {},
+            "export": {},
+            "bulk_delete": {},
+            "events": {},
+            "history": {"item": True, "tab": True},
+        }
+        for name, kwargs in actions.items():
+            viewset.action(name, **kwargs)(View)
+        self.table = viewset.action_table
+
+    def test_filter(self):
+        cases = [
+            (
+                {},
+                [
+                    "detail",
+                    "change",
+                    "export",
+                    "list",
+                    "add",
+                    "events",
+                    "history",
+                    "bulk_delete",
+                ],
+            ),
+            ({"item": True}, ["detail", "change", "history"]),
+            ({"item": True, "default": True}, ["detail"]),
+            ({"item": True, "tab": True}, ["history"]),
+            ({"item": False, "bulk": False}, ["export", "list", "add", "events"]),
+            (
+                {"item": False, "bulk": False, "hidden": False},
+                ["export", "list", "add"],
+            ),
+            ({"item": False, "default": True}, ["list"]),
+            ({"bulk": True}, ["bulk_delete"]),
+            ({"item": True, "bulk": True}, []),
+            # attributes not indexed
+            ({"perm": "view"}, ["detail", "export", "list", "events"]),
+            ({"item": True, "perm": "change"}, ["change"]),
+        ]
+        for kwargs, names in cases:
+            with self.subTest(**kwargs):
+                self.assertEqual(list(self.table.filter(**kwargs)), names)
+
+    def test_read_only(self):
+        action = self.table.actions["list"]
+        self.assertEqual(action.url_name, "things-list")
+        self.assertEqual(action.perm_name, "view_things")
+        with self.assertRaises(AttributeError):
+            action.perm = "add"
+        with self.assertRaises(TypeError):
+            self.table.filter(item=True)["add"] = action
+
+
+# entries are written by another thread, which sees only committed rows
+class QueuedAuditWriterTests(TransactionTestCase):
+    def test_queued_entries_written_on_stop(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "x")
+        groups = [Group.objects.create(name=f"group{i}") for i in range(5)]
+        writer = QueuedAuditWriter()
+        writer.batch_size = 2
+        for group in groups:
+            writer.write(build_entries(user, [group], ADDITION))
+        writer.stop()
+        self.assertFalse(writer.thread.is_alive())
+        self.assertEqual(
+            sorted(LogEntry.objects.values_list("object_repr", flat=True)),
+            [group.name for group in groups],
+        )
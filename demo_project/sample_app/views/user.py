@@ -1,9 +1,13 @@
 from django.contrib.auth.models import Group, User
 
 from classy_admin.views import (
+    BulkDeleteView,
+    BulkUpdateView,
     CreateView,
     DeleteView,
     DetailView,
+    EventStreamView,
+    ExportView,
     TableListView,
     UpdateView,
 )
@@ -24,6 +28,32 @@ class UserListView(TableListView):
         "is_staff",
         "is_superuser",
     ]
+    filterset_fields = ["is_active", "is_staff", "groups"]
+    facet_fields = ["is_active", "is_staff", "groups"]
+
+
+@user_vs.action("export", formats=ExportView.export_formats)
+class UserExportView(ExportView):
+    list_display = UserListView.list_display
+    filterset_fields = UserListView.filterset_fields
+
+
+@user_vs.action("bulk_delete")
+class UserBulkDeleteView(BulkDeleteView):
+    filterset_fields = UserListView.filterset_fields
+    log_repr_fields = ["username"]
+
+
+@user_vs.action(
+    "bulk_change", bulk=True, perm="change", verbose_name="alterar selecionados"
+)
+class UserBulkUpdateView(BulkUpdateView):
+    filterset_fields = UserListView.filterset_fields
+    fields = ["is_active", "is_staff"]
+    log_repr_fields = ["username"]
+
+
+user_vs.action("events")(EventStreamView)
 
 
 class UserFormMixin:
@@ -61,6 +91,7 @@ class UserDetailView(DetailView):
 @group_vs.action("list")
 class GroupListView(TableListView):
     list_display = ["name"]
+    live_updates = True
 
 
 @group_vs.action("add")
@@ -81,3 +112,6 @@ class GroupDeleteView(DeleteView):
 @group_vs.action("detail")
 class GroupDetailView(DetailView):
     pass
+
+
+group_vs.action("events")(EventStreamView)
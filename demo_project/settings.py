@@ -42,6 +42,8 @@ INSTALLED_APPS = [
     "crispy_bootstrap5",
     "simple_menu",
     "django_htmx",
+    "dynamic_preferences",
+    "dynamic_preferences.users.apps.UserPreferencesConfig",
     "classy_admin",
     "classy_admin.adminlte4",
     "demo_project.sample_app",
@@ -131,3 +133,6 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 CRISPY_ALLOWED_TEMPLATE_PACKS = ["bootstrap5"]
+
+# dashboard of registered widgets as home page
+CLASSY_ADMIN_DASHBOARD = True